@@ -1,33 +1,113 @@
-from flask import Flask, request, jsonify, send_file, send_from_directory
+from flask import Flask, request, jsonify, send_file, send_from_directory, Response
 from flask_cors import CORS
 import os
+import hashlib
+from collections import OrderedDict, defaultdict
 from werkzeug.utils import secure_filename
 import cv2
 import numpy as np
 from datetime import datetime
 import uuid
 import json
+import re
+import functools
+import sched
+import textwrap
 from dotenv import load_dotenv
+
+# Pillow renders caption overlays in-process, replacing the ImageMagick
+# subprocess that moviepy's TextClip shells out to
+try:
+    from PIL import Image as PILImage, ImageDraw as PILImageDraw, ImageFont as PILImageFont
+except ImportError:
+    PILImage = None
+
+# orjson is ~3x faster than stdlib json for small payloads; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def json_loads_fast(s):
+    """Parse JSON with orjson when installed, stdlib json otherwise"""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
 import openai
 from moviepy.editor import VideoFileClip, ImageClip, concatenate_videoclips, AudioFileClip, CompositeVideoClip, TextClip, AudioClip
 from moviepy.video.fx import all as vfx
 import tempfile
 import requests
 import base64
+import mimetypes
+import mmap
+
+# pybase64 is a drop-in for the stdlib encoder backed by SIMD kernels
+# (3-10x faster on multi-MB images); fall back to stdlib if not installed
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+# blake3 hashes uploads at SIMD speed; sha256 is the stdlib fallback
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+def b64encode_str(data):
+    """Base64-encode bytes to an ASCII string with the fastest available encoder"""
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode('ascii')
 import gtts  # Google Text-to-Speech
 import time
 import shutil
+import subprocess
 from typing import List, Optional
 from pydantic import BaseModel
-import asyncio
 import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import random
 from threading import Thread
 import math
 import traceback
 
-# Add Eleven Labs import
-import requests as elevenlabs_requests  # Using requests for Eleven Labs API
+# Session for Eleven Labs API traffic - keep-alive connection pooling saves
+# a TLS handshake (~100-300 ms) on every call to api.elevenlabs.io, and
+# transient gateway errors on idempotent requests are retried with backoff
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class TimeoutSession(requests.Session):
+    """
+    requests.Session with a default timeout, so an API call that forgets
+    to pass one can never hang a worker thread indefinitely. Explicit
+    per-call timeouts still win.
+    """
+    def __init__(self, timeout):
+        super().__init__()
+        self._default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self._default_timeout)
+        return super().request(method, url, **kwargs)
+
+elevenlabs_requests = TimeoutSession(timeout=(5, 120))
+elevenlabs_requests.mount('https://', HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+
+# DALL-E hands back short-lived blob-storage URLs; a shared pooled session
+# keeps those connections warm when several scene downloads run in parallel
+DALLE_SESSION = TimeoutSession(timeout=(5, 120))
+DALLE_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
 
 # Import our new modules
 from video_services import VideoGenerationService
@@ -47,9 +127,49 @@ from video_recommender import VideoRecommender
 
 load_dotenv()
 
+class SpooledUploadRequest(Flask.request_class):
+    """
+    Request class whose multipart parser spools uploads up to 8 MB in
+    memory. Werkzeug's default spills to a temp file past 500 KB, so a
+    typical photo paid a disk write-and-read round trip before
+    save_upload_deduped ever saw the first byte.
+    """
+    def _get_file_stream(self, total_content_length, content_type,
+                         filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024, mode='rb+')
+
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
 CORS(app)
 
+# Route Flask's JSON marshalling through orjson when it is installed -
+# every jsonify response and request.json parse gets the faster codec
+if orjson is not None:
+    from flask.json.provider import JSONProvider
+
+    # Serialize datetimes/UUIDs natively and allow numpy scalars in
+    # responses, mirroring what stdlib jsonify tolerated via str()
+    _ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    class OrjsonProvider(JSONProvider):
+        """Flask JSON provider backed by orjson"""
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=_ORJSON_OPTS).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            # Hand the raw orjson bytes to the Response, skipping the
+            # decode-to-str / re-encode round trip the default does
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(
+                orjson.dumps(obj, option=_ORJSON_OPTS),
+                mimetype='application/json'
+            )
+
+    app.json = OrjsonProvider(app)
+
 # Configure upload folder
 UPLOAD_FOLDER = 'uploads'
 OUTPUT_FOLDER = 'output'
@@ -57,6 +177,28 @@ ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg'}
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['OUTPUT_FOLDER'] = OUTPUT_FOLDER
+# Reject oversized uploads at parse time instead of streaming them to disk
+app.config['MAX_CONTENT_LENGTH'] = 200 * 1024 * 1024
+# Largest photo (in megapixels) accepted by the upload endpoint - anything
+# bigger than this is almost certainly a mistake and would bloat every
+# downstream stage even after normalization
+MAX_UPLOAD_MP = 12
+# When fronted by nginx/apache, let the proxy sendfile(2) downloads straight
+# from disk instead of streaming them through the Python worker
+app.config['USE_X_SENDFILE'] = os.getenv('USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+# nginx ignores X-Sendfile; set this to the internal location prefix
+# (e.g. '/protected-output', with `location /protected-output/
+# { internal; alias .../output/; }` in the nginx config) to serve
+# downloads via X-Accel-Redirect instead
+X_ACCEL_REDIRECT_PREFIX = os.getenv('X_ACCEL_REDIRECT_PREFIX', '').rstrip('/')
+# Target short side for DALL-E ad scene frames. DALL-E returns 1024px
+# squares; set this lower (e.g. 720) to downscale each scene once at
+# download time instead of pushing the extra pixels through every filter
+# and encode stage. 0 keeps the native resolution.
+AD_SCENE_SIDE = int(os.getenv('AD_SCENE_SIDE', '0'))
+# Optional ElevenLabs output format override (e.g. mp3_22050_32 for
+# smaller, lower-fidelity audio); empty keeps the API default quality
+ELEVEN_TTS_OUTPUT_FORMAT = os.getenv('ELEVEN_TTS_OUTPUT_FORMAT', '')
 
 # Create directories if they don't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -66,8 +208,19 @@ os.makedirs('voices', exist_ok=True)  # Directory for uploaded voice files
 os.makedirs('training', exist_ok=True)  # Directory for training data
 os.makedirs('models', exist_ok=True)  # Directory for trained models
 
-# Initialize OpenAI
-openai.api_key = os.getenv("OPENAI_API_KEY")
+# Initialize a single shared OpenAI client so every call reuses the same
+# pooled TCP/TLS connections instead of handshaking per request
+try:
+    openai_client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+except Exception as e:
+    print(f"Could not initialize OpenAI client: {e}")
+    openai_client = None
+
+# Resolved once at import - the per-call getenv lookups and "Using model"
+# prints added a stdout flush (a lock under a threaded server) to every
+# OpenAI request for a value that never changes at runtime
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
+print(f"Using OpenAI model: {OPENAI_MODEL}")
 
 # Initialize Eleven Labs API key
 ELEVEN_LABS_API_KEY = os.getenv("ELEVEN_LABS_API_KEY", "sk_66fa7dc6ab476345f1d4b6ebfd7d814f5b53045df4d6e909")
@@ -75,6 +228,30 @@ ELEVEN_LABS_API_KEY = os.getenv("ELEVEN_LABS_API_KEY", "sk_66fa7dc6ab476345f1d4b
 # Initialize DEEPA API key
 DEEPA_API_KEY = os.getenv("DEEPA_API_KEY", "1a0c4b07-e97f-44f2-b39e-90259c911e09")
 
+# Session for DEEPA traffic - keepalive means status polls stop re-doing
+# DNS/TCP/TLS every few seconds, and transient gateway errors are retried.
+# The pool is sized to the text-to-video worker count so a burst of jobs
+# multiplexes over warm connections instead of queueing on the adapter.
+DEEPA_MAX_CONNECTIONS = int(os.getenv('DEEPA_POLL_WORKERS', '8'))
+DEEPA_SESSION = TimeoutSession(timeout=(5, 60))
+DEEPA_SESSION.headers.update({"Authorization": f"Bearer {DEEPA_API_KEY}"})
+DEEPA_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=DEEPA_MAX_CONNECTIONS,
+    pool_maxsize=DEEPA_MAX_CONNECTIONS,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+))
+
+# Completed-video URLs can point at presigned third-party storage, which
+# rejects requests carrying an extra Authorization header - and the API
+# key must never leave api.deepa.ai anyway. Downloads go through this
+# unauthenticated session with the same pooling and retry policy.
+DEEPA_DOWNLOAD_SESSION = TimeoutSession(timeout=(5, 60))
+DEEPA_DOWNLOAD_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=DEEPA_MAX_CONNECTIONS,
+    pool_maxsize=DEEPA_MAX_CONNECTIONS,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+))
+
 # Debug output for API key check
 api_key = os.getenv("OPENAI_API_KEY")
 if api_key:
@@ -84,24 +261,640 @@ if api_key:
 else:
     print("ERROR: OpenAI API Key not found in environment variables!")
 
-# Initialize dictionaries to track jobs
-job_status = {}
-video_jobs = {}
-training_jobs = {}
+# Celery + Redis task queue for background video generation.
+# Falls back to in-process background threads when no broker is available
+# so the app still runs in local development without Redis.
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+
+try:
+    from celery import Celery
+    celery = Celery('videogen', broker=CELERY_BROKER_URL, backend=CELERY_RESULT_BACKEND)
+    celery.conf.update(
+        task_track_started=True,
+        # Route encode-heavy work and network-bound work to separate
+        # queues so workers can be sized per class: run e.g.
+        #   celery -A app worker -Q encode -c 2
+        #   celery -A app worker -Q io -c 8
+        task_default_queue='encode',
+        task_routes={
+            'videogen.process_text_to_video': {'queue': 'io'},
+        },
+    )
+    print(f"Celery configured with broker: {CELERY_BROKER_URL}")
+except ImportError:
+    celery = None
+    print("Celery not installed, background jobs will run in local threads")
+
+def _test_encode(codec):
+    """
+    One-frame smoke encode with the candidate codec. ffmpeg listing an
+    encoder only means it was compiled in - stock builds advertise
+    h264_nvenc on machines with no NVIDIA GPU, and picking one of those
+    would fail every render at runtime.
+    """
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-f', 'lavfi',
+             '-i', 'color=black:s=128x128', '-frames:v', '1',
+             '-c:v', codec, '-f', 'null', '-'],
+            capture_output=True, timeout=15
+        )
+        return result.returncode == 0
+    except Exception:
+        return False
+
+def _detect_hw_codec():
+    """
+    Probe ffmpeg once at startup for a usable hardware H.264 encoder.
+
+    Returns:
+        str: The first of h264_nvenc (NVIDIA), h264_videotoolbox (macOS),
+             h264_qsv (Intel) or h264_v4l2m2m (Jetson/ARM) that both
+             exists and passes a one-frame test encode, falling back to
+             libx264. USE_HW_ENCODE=0 forces software.
+    """
+    if os.getenv('USE_HW_ENCODE', '1').lower() in ('0', 'false', 'no'):
+        print("Hardware encoding disabled via USE_HW_ENCODE")
+        return 'libx264'
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-encoders'],
+            capture_output=True, text=True, timeout=10
+        )
+        for codec in ('h264_nvenc', 'h264_qsv', 'h264_amf', 'h264_videotoolbox', 'h264_v4l2m2m'):
+            if codec in result.stdout and _test_encode(codec):
+                print(f"Using hardware video encoder: {codec}")
+                return codec
+    except Exception as e:
+        print(f"Could not probe ffmpeg encoders: {e}")
+    return 'libx264'
+
+HW_VIDEO_CODEC = _detect_hw_codec()
+
+def direct_encode_args():
+    """
+    Encoder flags for the direct single-image render paths. On libx264 a
+    fast preset plus stillimage tuning roughly halves the encode time for
+    what is a static frame; hardware encoders get their usual tuning.
+    """
+    args = hw_codec_ffmpeg_params()
+    if HW_VIDEO_CODEC == 'libx264':
+        # Swap the shared fastdecode tune for stillimage - these renders
+        # are a static frame, and ffmpeg only honors the last -tune anyway
+        if '-tune' in args:
+            i = args.index('-tune')
+            del args[i:i + 2]
+        args += ['-preset', 'veryfast', '-tune', 'stillimage']
+    return args
+
+def run_ffmpeg(args, **kwargs):
+    """
+    Run ffmpeg with the shared startup flags prepended. -nostdin and a
+    quiet log level trim per-spawn overhead and keep child processes from
+    ever blocking on the terminal; every call site shares one spelling.
+    """
+    cmd = ['ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error', '-y'] + args
+    return subprocess.run(cmd, **kwargs)
+
+def hw_codec_write_kwargs():
+    """Extra write_videofile kwargs appropriate for the detected encoder"""
+    kwargs = {"threads": os.cpu_count()}
+    if HW_VIDEO_CODEC == 'h264_nvenc':
+        kwargs["preset"] = 'p4'
+    elif HW_VIDEO_CODEC == 'h264_qsv':
+        kwargs["preset"] = 'veryfast'
+    elif HW_VIDEO_CODEC == 'libx264':
+        # veryfast roughly halves encode time vs the default medium preset
+        # for a few percent larger files - the right trade for disposable
+        # social clips
+        kwargs["preset"] = 'veryfast'
+    return kwargs
+
+def hw_codec_ffmpeg_params():
+    """
+    Encoder-specific ffmpeg flags for write_videofile, always including
+    +faststart so the mp4 is streamable without a second rewrite pass.
+    """
+    params = ['-movflags', '+faststart']
+    if HW_VIDEO_CODEC == 'h264_nvenc':
+        params += ['-tune', 'll', '-rc', 'vbr', '-cq', '23', '-maxrate', '6M']
+    elif HW_VIDEO_CODEC == 'h264_qsv':
+        # ICQ quality mode, lookahead off - quicker first frame for
+        # these short clips
+        params += ['-global_quality', '23', '-look_ahead', '0']
+    elif HW_VIDEO_CODEC == 'h264_videotoolbox':
+        params += ['-realtime', '1']
+    elif HW_VIDEO_CODEC == 'libx264':
+        params += ['-tune', 'fastdecode']
+    return params
+
+# Content-addressed cache for OpenAI responses, keyed by the SHA-256 of the
+# uploaded image plus the request parameters. Repeat uploads of the same
+# image skip the vision/script/effects API calls entirely. A small in-memory
+# LRU sits in front of an optional diskcache layer that survives restarts.
+OPENAI_CACHE_MAX_ENTRIES = 500
+openai_memory_cache = OrderedDict()
+
+try:
+    import diskcache
+    openai_disk_cache = diskcache.Cache('cache/openai')
+except ImportError:
+    openai_disk_cache = None
+    print("diskcache not installed, OpenAI response cache will be memory-only")
+
+def hash_image_file(image_path):
+    """Return the SHA-256 hex digest of an image file's contents"""
+    with open(image_path, 'rb') as f:
+        try:
+            # mmap gives the hash a zero-copy view instead of materializing
+            # the whole file as a bytes object
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha256(mm).hexdigest()
+        except (ValueError, OSError):
+            # Empty or unmappable file - fall back to a plain read
+            return hashlib.sha256(f.read()).hexdigest()
+
+def openai_cache_get(key):
+    """Look up a cached OpenAI response, checking memory first, then disk"""
+    if key in openai_memory_cache:
+        openai_memory_cache.move_to_end(key)
+        return openai_memory_cache[key]
+    if openai_disk_cache is not None:
+        value = openai_disk_cache.get(key)
+        if value is not None:
+            # Promote disk hits into the memory cache
+            openai_memory_cache[key] = value
+        return value
+    return None
+
+def openai_cache_set(key, value):
+    """Store an OpenAI response in both cache layers, evicting oldest entries"""
+    openai_memory_cache[key] = value
+    while len(openai_memory_cache) > OPENAI_CACHE_MAX_ENTRIES:
+        openai_memory_cache.popitem(last=False)
+    if openai_disk_cache is not None:
+        openai_disk_cache.set(key, value)
+
+# Cached /v1/voices listing with a short TTL - the catalog barely changes,
+# so hitting the API once per process instead of once per request saves
+# ~500ms on every voiceover and listing call
+_VOICE_LIST_CACHE = {"expires": 0.0, "voices": []}
+_voice_list_lock = threading.Lock()
+VOICE_LIST_TTL = 600
+
+def get_elevenlabs_voices():
+    """Return the ElevenLabs voice list, cached for VOICE_LIST_TTL seconds"""
+    now = time.time()
+    with _voice_list_lock:
+        if now < _VOICE_LIST_CACHE["expires"]:
+            return _VOICE_LIST_CACHE["voices"]
+    try:
+        response = elevenlabs_requests.get(
+            "https://api.elevenlabs.io/v1/voices",
+            headers={"xi-api-key": ELEVEN_LABS_API_KEY, "Accept": "application/json"},
+            timeout=10
+        )
+        if response.status_code == 200:
+            voices = response.json().get("voices", [])
+            with _voice_list_lock:
+                _VOICE_LIST_CACHE["voices"] = voices
+                _VOICE_LIST_CACHE["expires"] = now + VOICE_LIST_TTL
+            return voices
+        print(f"Could not list ElevenLabs voices: {response.status_code}")
+    except Exception as e:
+        print(f"Could not list ElevenLabs voices: {e}")
+    # Serve stale data rather than nothing when the API is unreachable
+    return _VOICE_LIST_CACHE["voices"]
 
-# In-memory storage for training models
-training_models = {}
+def invalidate_elevenlabs_voices():
+    """Force the next get_elevenlabs_voices() call to refetch"""
+    with _voice_list_lock:
+        _VOICE_LIST_CACHE["expires"] = 0.0
 
-def process_video_generation(job_id, image_path, request_data, voice_file=None, model_id=None):
+def elevenlabs_voice_id(voice_name, default=None):
+    """
+    Resolve a voice name to its ElevenLabs voice ID. The name -> id map is
+    built once per cached listing, so lookups are a dict hit instead of an
+    API round-trip plus linear scan.
+    """
+    voices = get_elevenlabs_voices()
+    with _voice_list_lock:
+        if _VOICE_LIST_CACHE.get("map_for") is not voices:
+            _VOICE_LIST_CACHE["map"] = {v.get("name"): v.get("voice_id") for v in voices}
+            _VOICE_LIST_CACHE["map_for"] = voices
+        return _VOICE_LIST_CACHE["map"].get(voice_name, default)
+
+# Persistent map of voice-file SHA-256 -> ElevenLabs voice ID so repeat jobs
+# skip the /v1/voices listing round-trip and never re-upload the same clone
+VOICE_MAP_PATH = os.path.join('voices', 'voice_map.json')
+voice_id_map = {}
+if os.path.exists(VOICE_MAP_PATH):
+    try:
+        with open(VOICE_MAP_PATH, 'r') as f:
+            voice_id_map = json.load(f)
+    except Exception as e:
+        print(f"Could not load voice map: {e}")
+
+def save_voice_id(voice_sha, voice_id):
+    """Record a cloned voice ID in the map and persist it atomically"""
+    voice_id_map[voice_sha] = voice_id
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir='voices', suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(voice_id_map, f)
+        os.replace(tmp_path, VOICE_MAP_PATH)
+    except Exception as e:
+        print(f"Could not persist voice map: {e}")
+
+# Generic per-directory listing cache, refreshed when the dir mtime
+# changes - request handlers stop paying an os.listdir per hit
+_dir_listing_cache = {}
+_dir_listing_lock = threading.Lock()
+
+def _list_dir_cached(path):
+    """Return a cached os.listdir(path), refreshing if the dir changed"""
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return []
+    with _dir_listing_lock:
+        entry = _dir_listing_cache.get(path)
+        if entry is None or entry["mtime"] != mtime:
+            entry = {"mtime": mtime, "files": os.listdir(path)}
+            _dir_listing_cache[path] = entry
+        return entry["files"]
+
+# Cached index of the voices directory, so request handlers do a dict
+# lookup instead of an os.listdir scan per request. The listing refreshes
+# automatically when the directory mtime changes (new file added).
+_voice_dir_cache = {"mtime": None, "files": [], "index": {}}
+_voice_dir_lock = threading.Lock()
+
+def _list_voice_files():
+    """Return the cached voices listing, refreshing it if the dir changed"""
+    try:
+        mtime = os.stat('voices').st_mtime
+    except OSError:
+        return []
+    with _voice_dir_lock:
+        if _voice_dir_cache["mtime"] != mtime:
+            files = os.listdir('voices')
+            _voice_dir_cache["files"] = files
+            _voice_dir_cache["index"] = {
+                fn[len('voice_'):].rsplit('.', 1)[0]: os.path.join('voices', fn)
+                for fn in files if fn.startswith('voice_')
+            }
+            _voice_dir_cache["mtime"] = mtime
+        return _voice_dir_cache["files"]
+
+# cloned_voices.json parsed once per change, keyed on the file mtime -
+# the voice selector endpoint otherwise re-reads and re-parses it per hit
+_cloned_voices_cache = {"mtime": None, "voices": []}
+_cloned_voices_lock = threading.Lock()
+
+def load_cloned_voices(path):
+    """Return the parsed cloned-voices list, re-reading only on mtime change"""
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return []
+    with _cloned_voices_lock:
+        if _cloned_voices_cache["mtime"] != mtime:
+            try:
+                with open(path, 'r') as f:
+                    _cloned_voices_cache["voices"] = json.load(f)
+            except Exception as e:
+                print(f"Error loading cloned voices: {str(e)}")
+                _cloned_voices_cache["voices"] = []
+            _cloned_voices_cache["mtime"] = mtime
+        return _cloned_voices_cache["voices"]
+
+def find_voice_file(voice_id):
+    """
+    Resolve a voice ID to its file path. O(1) against the index for
+    canonically named files, with a substring fallback over the cached
+    listing - no directory scan either way.
+    """
+    files = _list_voice_files()
+    path = _voice_dir_cache["index"].get(voice_id)
+    if path:
+        return path
+    for fn in files:
+        if voice_id in fn:
+            path = os.path.join('voices', fn)
+            # Remember the resolution so repeat lookups of the same
+            # non-canonical name are dict hits too
+            with _voice_dir_lock:
+                _voice_dir_cache["index"][voice_id] = path
+            return path
+    return None
+
+# Build the index at boot rather than on the first request
+_list_voice_files()
+
+# Redis client for shared job state. Job records written from background
+# threads were invisible to other gunicorn/uWSGI workers and lost on restart;
+# mirroring them into Redis hashes fixes both. Falls back to in-process
+# storage when no Redis is reachable.
+try:
+    import redis as redis_lib
+    _redis_client = redis_lib.Redis.from_url(
+        os.getenv('REDIS_URL', CELERY_BROKER_URL),
+        decode_responses=True,
+        socket_connect_timeout=2
+    )
+    _redis_client.ping()
+    print("Redis connected, job state will be shared across workers")
+except Exception as e:
+    _redis_client = None
+    print(f"Redis not available, job state will be in-process only: {e}")
+
+class AttrDict(dict):
+    """
+    Dict that also supports attribute access (record.progress and
+    record["progress"] both work). Records can be attached to a JobStore so
+    every field update is written through to Redis.
+    """
+    def attach(self, store, key):
+        object.__setattr__(self, '_store', store)
+        object.__setattr__(self, '_store_key', key)
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setitem__(self, key, value):
+        # Item writes persist just like attribute writes - the advanced
+        # pipeline updates its records with record["field"] = value
+        super().__setitem__(key, value)
+        store = self.__dict__.get('_store')
+        if store is not None:
+            store.persist(self.__dict__['_store_key'], self)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+    def dict(self):
+        """Plain-dict view for jsonify responses"""
+        return dict(self)
+
+class JobStatus(AttrDict):
+    """Status record for a background job"""
+    def __init__(self, status="pending", progress=0, result=None, error=None,
+                 estimated_time_remaining=None, started_at=None, **extra):
+        super().__init__(
+            status=status,
+            progress=progress,
+            result=result,
+            error=error,
+            estimated_time_remaining=estimated_time_remaining,
+            started_at=started_at,
+            **extra
+        )
+
+class TrainingFile(AttrDict):
+    """A single uploaded training file"""
+    def __init__(self, id=None, filename=None, type=None, url=None, **extra):
+        super().__init__(id=id, filename=filename, type=type, url=url, **extra)
+
+class TrainingModel(AttrDict):
+    """A user-trained personalization model and its uploaded files"""
+    def __init__(self, id=None, name=None, created_at=None, status="uploaded",
+                 training_files=None, **extra):
+        super().__init__(
+            id=id,
+            name=name,
+            created_at=created_at,
+            status=status,
+            training_files=training_files or [],
+            **extra
+        )
+
+class JobStore:
+    """
+    Dict-like store for job and model records. Writes land in an in-process
+    cache and, when Redis is reachable, are mirrored to a Redis hash with a
+    TTL so state survives restarts and is visible to every worker. Reads
+    that miss the local cache fall back to Redis.
+
+    Reads of in-flight records always go back to Redis: another process
+    (Celery worker, pool child) may be advancing the job, so a cached
+    snapshot of a non-terminal record is stale the moment it is taken.
+    Only terminal records - which never change again - are served from
+    the local cache without a refresh.
+
+    The local cache is LRU-bounded: job results carry full script text and
+    analysis strings, so without eviction a long-lived worker leaks a few
+    KB per job forever. Evicted records are rebuilt from Redis on demand.
+    """
+
+    _TERMINAL_STATUSES = ('completed', 'failed')
+    def __init__(self, prefix, record_class=AttrDict, ttl=86400, maxsize=1000):
+        self.prefix = prefix
+        self.record_class = record_class
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._local = OrderedDict()
+        # Worker threads write records while request threads read them;
+        # the LRU reordering mutates the OrderedDict on reads too, so every
+        # access goes through this lock
+        self._lock = threading.RLock()
+
+    def _redis_key(self, key):
+        return f"{self.prefix}:{key}"
+
+    def persist(self, key, record):
+        """Mirror a record into its Redis hash, field by field"""
+        if _redis_client is None:
+            return
+        try:
+            mapping = {k: json.dumps(v) for k, v in dict(record).items()}
+            if mapping:
+                _redis_client.hset(self._redis_key(key), mapping=mapping)
+                _redis_client.expire(self._redis_key(key), self.ttl)
+        except Exception as e:
+            print(f"Could not persist {self._redis_key(key)} to Redis: {e}")
+
+    def _fetch(self, key):
+        """Rebuild a record from Redis after a local-cache miss"""
+        if _redis_client is None:
+            return None
+        try:
+            data = _redis_client.hgetall(self._redis_key(key))
+        except Exception as e:
+            print(f"Could not read {self._redis_key(key)} from Redis: {e}")
+            return None
+        if not data:
+            return None
+        record = self.record_class(**{k: json.loads(v) for k, v in data.items()})
+        record.attach(self, key)
+        with self._lock:
+            self._local[key] = record
+            self._evict()
+        return record
+
+    def _evict(self):
+        """Drop least-recently-used records once the local cache is full"""
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    def __setitem__(self, key, record):
+        if isinstance(record, dict) and not isinstance(record, AttrDict):
+            # Promote plain dict literals so later updates write through
+            # to Redis like every other record
+            record = self.record_class(**record)
+        with self._lock:
+            self._local[key] = record
+            self._local.move_to_end(key)
+            self._evict()
+        if isinstance(record, AttrDict):
+            record.attach(self, key)
+        self.persist(key, record)
+
+    def _is_terminal(self, record):
+        """True when the record can never change again"""
+        return record.get('status') in self._TERMINAL_STATUSES
+
+    def __getitem__(self, key):
+        with self._lock:
+            record = self._local.get(key)
+            if record is not None:
+                self._local.move_to_end(key)
+        if record is not None and _redis_client is not None and not self._is_terminal(record):
+            # Still in flight - another process may own this job, so the
+            # Redis copy is the truth, not our snapshot
+            fresh = self._fetch(key)
+            if fresh is not None:
+                record = fresh
+        if record is None:
+            record = self._fetch(key)
+        if record is None:
+            raise KeyError(key)
+        return record
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._local:
+                return True
+        return self._fetch(key) is not None
+
+    def values(self):
+        if _redis_client is not None:
+            # Pick up records written by other workers before listing,
+            # and refresh in-flight ones they may have advanced
+            try:
+                for redis_key in _redis_client.scan_iter(match=f"{self.prefix}:*"):
+                    key = redis_key.split(':', 1)[1]
+                    with self._lock:
+                        record = self._local.get(key)
+                    if record is None or not self._is_terminal(record):
+                        self._fetch(key)
+            except Exception as e:
+                print(f"Could not scan {self.prefix} records from Redis: {e}")
+        with self._lock:
+            return list(self._local.values())
+
+# Job and model state, shared via Redis when available
+# Job records are only polled while a generation runs, so an hour of
+# retention is plenty; models are browsed for much longer
+job_status = JobStore('job', JobStatus, ttl=3600)
+training_models = JobStore('model', TrainingModel)
+
+# Advanced-generation and training job state, same store semantics
+video_jobs = JobStore('video_job')
+training_jobs = JobStore('training_job')
+
+# Shared worker pool for in-process video jobs. Each job drives an ffmpeg
+# encode that already saturates the CPU, so we cap concurrency instead of
+# spawning an unbounded thread per request; extra submissions queue up.
+# MoviePy's write loop holds the GIL between pipe reads, so concurrent
+# jobs in threads serialize; set VIDEO_PROCESS_POOL=1 to use real worker
+# processes instead. Opt-in, and only valid with Redis reachable - the
+# children publish job state through the JobStore's Redis mirror.
+_VIDEO_WORKERS = int(os.getenv('VIDEO_WORKERS', '2'))
+if _redis_client is not None and os.getenv('VIDEO_PROCESS_POOL', '0').lower() in ('1', 'true', 'yes'):
+    VIDEO_POOL = ProcessPoolExecutor(max_workers=_VIDEO_WORKERS)
+    print(f"Video jobs will run in {_VIDEO_WORKERS} worker processes")
+else:
+    VIDEO_POOL = ThreadPoolExecutor(
+        max_workers=_VIDEO_WORKERS,
+        thread_name_prefix='videogen'
+    )
+
+# Pool for overlapping independent OpenAI calls within a job; module-level
+# so per-job work does not pay thread create/destroy
+OPENAI_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='openai')
+
+# Separate, wider pool for DEEPA text-to-video jobs. Those spend minutes
+# blocked on the remote API between polls, so parking them on the encode
+# pool would starve CPU-bound jobs; waiting threads are cheap.
+DEEPA_POLL_POOL = ThreadPoolExecutor(
+    max_workers=DEEPA_MAX_CONNECTIONS,
+    thread_name_prefix='deepa-poll'
+)
+
+# Exponentially weighted moving average of per-stage durations across jobs,
+# keyed by the progress checkpoint the stage ended at. Summing the means of
+# the stages still ahead gives a far more stable ETA than extrapolating from
+# wall-clock elapsed time on every progress bump.
+_STAGE_ALPHA = 0.3
+_STAGE_TIMES = {}
+_stage_times_lock = threading.Lock()
+
+# Wall-clock time of the last progress checkpoint per in-flight job
+_job_stage_started = {}
+
+def record_stage_time(progress, duration):
+    """Fold one observed stage duration into the EWMA for that checkpoint"""
+    with _stage_times_lock:
+        previous = _STAGE_TIMES.get(progress, duration)
+        _STAGE_TIMES[progress] = _STAGE_ALPHA * duration + (1 - _STAGE_ALPHA) * previous
+
+def update_job_progress(job_id, progress, task=None):
+    """
+    Update the progress of a job in job_status and, when running under a
+    Celery worker, publish the same progress on the task state.
+
+    Args:
+        job_id (str): The unique job ID
+        progress (int): The new progress percentage
+        task: The bound Celery task instance, if running under Celery
+    """
+    # Record how long the stage that just finished took
+    now = time.perf_counter()
+    stage_started = _job_stage_started.get(job_id)
+    if stage_started is not None:
+        record_stage_time(progress, now - stage_started)
+    _job_stage_started[job_id] = now
+
+    eta = None
+    if job_id in job_status:
+        job_status[job_id].progress = progress
+        eta = update_estimated_time(job_status[job_id], progress)
+        job_status[job_id].estimated_time_remaining = eta
+    if task is not None:
+        task.update_state(state='PROGRESS', meta={'progress': progress, 'eta': eta})
+
+def process_video_generation(job_id, image_path, request_data, voice_file=None, model_id=None, task=None):
     """
     Process video generation in the background
-    
+
     Args:
         job_id (str): The unique job ID
         image_path (str): Path to the image
         request_data (dict): Request data including style, duration, etc.
         voice_file (str, optional): Path to a custom voice file
         model_id (str, optional): ID of a trained model to use
+        task: The bound Celery task instance, if running under Celery
     """
     try:
         # Create JobStatus object with initial time estimate
@@ -119,54 +912,99 @@ def process_video_generation(job_id, image_path, request_data, voice_file=None,
         
         # Get full path
         full_image_path = image_path
-        
-        # Update progress to 10%
-        job_status[job_id].progress = 10
-        job_status[job_id].estimated_time_remaining = update_estimated_time(job_status[job_id], 10)
-        
-        # Analyze the image using OpenAI's vision model
-        try:
-            image_analysis = analyze_image(full_image_path)
-        except Exception as e:
-            print(f"Error in analyze_image: {e}")
-            job_status[job_id].status = "failed"
-            job_status[job_id].error = f"Failed to analyze image: {str(e)}"
-            return
-        
-        # Update progress to 20%
-        job_status[job_id].progress = 20
-        job_status[job_id].estimated_time_remaining = update_estimated_time(job_status[job_id], 20)
-        
-        # Generate script based on image analysis
-        try:
-            script = generate_video_script(image_analysis, request_data.get('style', 'casual'), request_data.get('duration', 15))
-            # Extract the script text if it's a dictionary
-            if isinstance(script, dict) and 'script' in script:
-                script_text = script['script']
-            else:
-                script_text = script
-        except Exception as e:
-            print(f"Error in script generation: {e}")
-            job_status[job_id].status = "failed"
-            job_status[job_id].error = f"Failed to generate script: {str(e)}"
-            return
-        
-        # Update progress to 30%
-        job_status[job_id].progress = 30
-        job_status[job_id].estimated_time_remaining = update_estimated_time(job_status[job_id], 30)
-        
-        # Suggest effects based on image analysis
+
+        # Normalize oversized photos before anything downstream touches
+        # them; done before hashing so cache keys match the encoded pixels
+        downscale_image_inplace(full_image_path)
+
+        # Hash the image once so all three OpenAI calls can share the cache
         try:
-            effects = suggest_effects(image_analysis, request_data.get('style', 'casual'))
+            image_hash = hash_image_file(full_image_path)
         except Exception as e:
-            print(f"Error in suggest_effects: {e}")
-            # Fallback to empty effects list
-            effects = []
-        
+            print(f"Could not hash image for caching: {e}")
+            image_hash = None
+
+        # Update progress to 10%
+        update_job_progress(job_id, 10, task)
+
+        # One fused OpenAI call covers analysis, script and effects - a
+        # single round trip instead of three on the critical path
+        combined = analyze_script_and_effects(
+            full_image_path,
+            request_data.get('style', 'casual'),
+            request_data.get('duration', 15),
+            image_hash=image_hash
+        )
+        if combined is not None:
+            script_text = combined["script"]
+            effects = combined["effects"]
+        else:
+            # Fallback: the original three-call flow, with script and
+            # effects still fetched concurrently
+
+            # Analyze the image using OpenAI's vision model
+            try:
+                image_analysis = analyze_image(full_image_path, image_hash=image_hash)
+            except Exception as e:
+                print(f"Error in analyze_image: {e}")
+                job_status[job_id].status = "failed"
+                job_status[job_id].error = f"Failed to analyze image: {str(e)}"
+                return
+
+            # Update progress to 20%
+            update_job_progress(job_id, 20, task)
+
+            script_future = OPENAI_POOL.submit(
+                generate_video_script,
+                image_analysis,
+                request_data.get('style', 'casual'),
+                request_data.get('duration', 15),
+                image_hash=image_hash
+            )
+            effects_future = OPENAI_POOL.submit(
+                suggest_effects,
+                image_analysis,
+                request_data.get('style', 'casual'),
+                image_hash=image_hash
+            )
+
+            # Generate script based on image analysis
+            try:
+                script = script_future.result()
+                # Extract the script text if it's a dictionary
+                if isinstance(script, dict) and 'script' in script:
+                    script_text = script['script']
+                else:
+                    script_text = script
+            except Exception as e:
+                print(f"Error in script generation: {e}")
+                job_status[job_id].status = "failed"
+                job_status[job_id].error = f"Failed to generate script: {str(e)}"
+                return
+
+            # Update progress to 30%
+            update_job_progress(job_id, 30, task)
+
+            # Suggest effects based on image analysis
+            try:
+                effects = effects_future.result()
+            except Exception as e:
+                print(f"Error in suggest_effects: {e}")
+                # Fallback to empty effects list
+                effects = []
+
         # Update progress to 40%
-        job_status[job_id].progress = 40
-        job_status[job_id].estimated_time_remaining = update_estimated_time(job_status[job_id], 40)
-        
+        update_job_progress(job_id, 40, task)
+
+        # Start TTS synthesis on the I/O pool while the video renders, so
+        # the voiceover stage consumes a finished audio file instead of
+        # paying max(render, tts) + tts
+        tts_future = None
+        if request_data.get('add_voiceover', False) and script_text:
+            tts_future = OPENAI_POOL.submit(
+                generate_tts_audio, script_text, voice_file=voice_file
+            )
+
         # Create video using available template
         try:
             if request_data.get('template'):
@@ -187,17 +1025,16 @@ def process_video_generation(job_id, image_path, request_data, voice_file=None,
                 )
             
             # Update progress to 80%
-            job_status[job_id].progress = 80
-            job_status[job_id].estimated_time_remaining = update_estimated_time(job_status[job_id], 80)
+            update_job_progress(job_id, 80, task)
             
             # Add voiceover if requested
             if request_data.get('add_voiceover', False):
                 try:
-                    # Generate TTS audio
-                    audio_path = generate_tts_audio(script_text, output_path=None, voice_file=voice_file)
-                    
-                    # Add voiceover to video
-                    final_video_result = add_voiceover_to_video(video_path, script_text, voice_file=voice_file)
+                    # Consume the TTS track synthesized during the render
+                    final_video_result = add_voiceover_to_video(
+                        video_path, script_text, voice_file=voice_file,
+                        tts_result=tts_future.result() if tts_future else None
+                    )
                     
                     # Use final video with voiceover if successful
                     if final_video_result["success"]:
@@ -207,8 +1044,7 @@ def process_video_generation(job_id, image_path, request_data, voice_file=None,
                     # Continue with the video without voiceover
             
             # Update progress to 90%
-            job_status[job_id].progress = 90
-            job_status[job_id].estimated_time_remaining = update_estimated_time(job_status[job_id], 90)
+            update_job_progress(job_id, 90, task)
             
             # Get relative path for frontend
             relative_video_path = video_path
@@ -235,6 +1071,17 @@ def process_video_generation(job_id, image_path, request_data, voice_file=None,
         if job_id in job_status:
             job_status[job_id].status = "failed"
             job_status[job_id].error = f"Failed to generate video: {str(e)}"
+    finally:
+        # Drop the per-job stage timer so finished jobs don't accumulate
+        _job_stage_started.pop(job_id, None)
+
+if celery is not None:
+    @celery.task(bind=True, name='videogen.process_video_generation')
+    def process_video_generation_task(self, image_path, request_data, voice_file=None, model_id=None):
+        """Celery entry point for video generation; the task ID doubles as the job ID"""
+        process_video_generation(self.request.id, image_path, request_data, voice_file, model_id, task=self)
+        final_status = job_status.get(self.request.id)
+        return dict(final_status) if final_status else None
 
 def update_estimated_time(job_data, current_progress):
     """
@@ -247,6 +1094,24 @@ def update_estimated_time(job_data, current_progress):
     Returns:
         Updated estimated time remaining in seconds
     """
+    # Back-to-back calls at the same progress (status polls between
+    # checkpoints) reuse the last estimate instead of recomputing
+    if (job_data.get("eta_progress") == current_progress
+            and job_data.get("estimated_time_remaining") is not None):
+        return job_data["estimated_time_remaining"]
+    # Item assignment on purpose: rides along with the next persist instead
+    # of triggering a Redis write of its own
+    job_data["eta_progress"] = current_progress
+
+    # Prefer the EWMA of stage durations learned from previous jobs - it is
+    # immune to the jitter that wall-clock extrapolation amplifies
+    with _stage_times_lock:
+        remaining_stages = [v for k, v in _STAGE_TIMES.items() if k > current_progress]
+    if remaining_stages:
+        return int(sum(remaining_stages))
+
+    # No stage history yet (first job since startup) - fall back to
+    # extrapolating from elapsed time
     # If there's no start time, return the original estimate
     if "started_at" not in job_data or not job_data["started_at"]:
         return job_data.get("estimated_time_remaining", 60)  # Default to 60 seconds if not set
@@ -270,64 +1135,196 @@ def update_estimated_time(job_data, current_progress):
 # Simple root route for testing
 @app.route('/')
 def index():
-    return jsonify({
-        "status": "API is running",
-        "endpoints": [
-            {"method": "POST", "url": "/api/upload-photo", "description": "Upload a photo"},
-            {"method": "POST", "url": "/api/generate-video", "description": "Generate a video"},
-            {"method": "GET", "url": "/api/status/<job_id>", "description": "Check job status"},
-            {"method": "POST", "url": "/api/generate-video-from-text", "description": "Generate video from text prompt"},
-            {"method": "POST", "url": "/api/generate-ad", "description": "Generate professional advertisement"},
-            {"method": "POST", "url": "/api/generate-advanced-video", "description": "Generate advanced motion video with AI"}
-        ]
-    })
+    # Constant payload, serialized once at import like the catalogs
+    return Response(_INDEX_JSON, mimetype='application/json')
+
+def allowed_file(filename, extensions=None):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in (extensions or ALLOWED_EXTENSIONS)
 
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+def save_upload_deduped(file, dest_dir, prefix=''):
+    """
+    Stream an uploaded file to disk, naming it by its content hash so a
+    re-upload of the same bytes is a no-op instead of a second copy.
+
+    Args:
+        file: Werkzeug FileStorage from request.files
+        dest_dir: Directory to store the file in
+        prefix: Optional filename prefix (e.g. "image_")
+
+    Returns:
+        tuple: (filename, filepath, content_hash)
+    """
+    ext = os.path.splitext(secure_filename(file.filename))[1].lower()
+    hasher = blake3.blake3() if blake3 is not None else hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir)
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            for chunk in iter(lambda: file.stream.read(1 << 20), b''):
+                hasher.update(chunk)
+                tmp.write(chunk)
+        content_hash = hasher.hexdigest()[:16]
+        filename = f"{prefix}{content_hash}{ext}"
+        filepath = os.path.join(dest_dir, filename)
+        if os.path.exists(filepath):
+            # Same bytes already on disk - drop the duplicate
+            os.remove(tmp_path)
+        else:
+            # Same-directory rename, so this is atomic
+            os.replace(tmp_path, filepath)
+        return filename, filepath, content_hash
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def send_immutable_file(directory, filename):
+    """
+    Serve a file whose name embeds a hash or UUID, so the bytes never
+    change for a given URL: immutable Cache-Control plus a stat-based
+    strong ETag turn repeat fetches into 304s or pure browser-cache hits.
+    """
+    response = send_from_directory(directory, filename, conditional=True)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    try:
+        st = os.stat(os.path.join(directory, filename))
+        response.set_etag(f"{st.st_mtime_ns:x}-{st.st_size:x}")
+    except OSError:
+        pass
+    return response.make_conditional(request)
+
+def _sniff_image_magic(filepath):
+    """
+    Check the file's magic bytes against the accepted image formats. Used
+    when Pillow is unavailable, so upload validation never has to decode
+    the full image the way a cv2.imread probe would.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            head = f.read(8)
+    except OSError:
+        return False
+    return (head.startswith(b'\xff\xd8\xff')            # JPEG
+            or head.startswith(b'\x89PNG\r\n\x1a\n'))   # PNG
+
+def downscale_image_inplace(image_path, max_short_side=1080):
+    """
+    Cap an image's short side at max_short_side pixels, overwriting the
+    file in place. Encoding a 12-megapixel phone photo at 30fps is
+    brutally slow and the output is capped around 1080p anyway, so
+    normalizing early shrinks every downstream stage (base64, ImageClip,
+    libx264) by the pixel-count ratio.
+
+    Args:
+        image_path: Path to the image on disk
+        max_short_side: Maximum length of the shorter image side
+
+    Returns:
+        bool: True if the file was rewritten, False if left untouched
+    """
+    try:
+        img = cv2.imread(image_path)
+        if img is None:
+            return False
+        h, w = img.shape[:2]
+        scale = max_short_side / min(h, w)
+        if scale >= 1.0:
+            return False
+        img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        cv2.imwrite(image_path, img)
+        print(f"Downscaled {image_path} from {w}x{h} to {img.shape[1]}x{img.shape[0]}")
+        return True
+    except Exception as e:
+        print(f"Could not downscale image: {e}")
+        return False
 
-def analyze_image(image_path):
+def encode_image_for_vision(image_path, max_side=1024, jpeg_quality=85):
+    """
+    Downscale and JPEG-recompress an image, then base64 it for a vision
+    API payload. GPT-4o resizes internally anyway, so shipping the raw
+    multi-MB upload just wastes bandwidth and encode CPU.
+
+    Args:
+        image_path: Path to the image on disk
+        max_side: Longest side after downscaling
+        jpeg_quality: JPEG re-compression quality
+
+    Returns:
+        str: Base64-encoded JPEG (or raw file bytes when OpenCV cannot
+             decode the file)
+    """
+    img = cv2.imread(image_path)
+    if img is not None:
+        h, w = img.shape[:2]
+        scale = max_side / max(h, w)
+        if scale < 1:
+            img = cv2.resize(img, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+        ok, buf = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+        if ok:
+            # The encoder accepts the ndarray via the buffer protocol, so
+            # skip the tobytes() copy of the JPEG
+            return b64encode_str(buf)
+
+    # Fall back to the raw file if OpenCV could not decode it, encoding
+    # straight from an mmap view to avoid holding a second copy in memory
+    with open(image_path, "rb") as image_file:
+        try:
+            with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return b64encode_str(mm)
+        except (ValueError, OSError):
+            return b64encode_str(image_file.read())
+
+def analyze_image(image_path, image_hash=None):
     """Analyze image using OpenAI's vision model"""
     try:
-        model = os.getenv("OPENAI_MODEL", "gpt-4o")
-        print(f"Using model: {model}")
+        # Serve repeat uploads of the same image from the cache
+        if image_hash:
+            cached = openai_cache_get((image_hash, 'analyze_image'))
+            if cached is not None:
+                print(f"Using cached image analysis for {image_hash[:12]}")
+                return cached
 
-        # Read image file and convert to base64
-        with open(image_path, "rb") as image_file:
-            base64_image = base64.b64encode(image_file.read()).decode('ascii')
-            
-            response = openai.chat.completions.create(
-                model=model,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": "Analyze this image and provide details about the person's appearance, expression, and any notable features that would be important for video generation."
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{base64_image}"
-                                }
+        base64_image = encode_image_for_vision(image_path)
+
+        response = openai_client.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": "Analyze this image and provide details about the person's appearance, expression, and any notable features that would be important for video generation."
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/jpeg;base64,{base64_image}"
                             }
-                        ]
-                    }
-                ],
-                max_tokens=500
-            )
-            return {"analysis": response.choices[0].message.content}
+                        }
+                    ]
+                }
+            ],
+            max_tokens=500
+        )
+        result = {"analysis": response.choices[0].message.content}
+        if image_hash:
+            openai_cache_set((image_hash, 'analyze_image'), result)
+        return result
     except Exception as e:
         print(f"Error in analyze_image: {str(e)}")
         return {"error": str(e)}
 
-def generate_video_script(image_analysis, style, duration):
+def generate_video_script(image_analysis, style, duration, image_hash=None):
     """Generate video script using OpenAI"""
     try:
-        model = os.getenv("OPENAI_MODEL", "gpt-4o")
-        print(f"Using model for script generation: {model}")
-        response = openai.chat.completions.create(
-            model=model,
+        if image_hash:
+            cached = openai_cache_get((image_hash, 'generate_video_script', style, duration))
+            if cached is not None:
+                print(f"Using cached video script for {image_hash[:12]}")
+                return cached
+
+        response = openai_client.chat.completions.create(
+            model=OPENAI_MODEL,
             messages=[
                 {
                     "role": "system",
@@ -350,18 +1347,30 @@ def generate_video_script(image_analysis, style, duration):
             ],
             max_tokens=1000
         )
-        return {"script": response.choices[0].message.content}
+        result = {"script": response.choices[0].message.content}
+        if image_hash:
+            openai_cache_set((image_hash, 'generate_video_script', style, duration), result)
+        return result
     except Exception as e:
         print(f"Error in generate_video_script: {str(e)}")
         return {"error": str(e)}
 
-def suggest_effects(image_analysis, style):
+# Compiled once - suggest_effects falls back to these when the model's
+# response cannot be parsed as a JSON array
+_EFFECTS_ARRAY_RE = re.compile(r'\[([^\]]*)\]', re.DOTALL)
+_DEFAULT_EFFECTS = ["zoom", "fade_in", "fade_out", "color_enhance", "slow_motion"]
+
+def suggest_effects(image_analysis, style, image_hash=None):
     """Suggest video effects using OpenAI"""
     try:
-        model = os.getenv("OPENAI_MODEL", "gpt-4o")
-        print(f"Using model for effects suggestion: {model}")
-        response = openai.chat.completions.create(
-            model=model,
+        if image_hash:
+            cached = openai_cache_get((image_hash, 'suggest_effects', style))
+            if cached is not None:
+                print(f"Using cached effects for {image_hash[:12]}")
+                return cached
+
+        response = openai_client.chat.completions.create(
+            model=OPENAI_MODEL,
             messages=[
                 {
                     "role": "system",
@@ -384,72 +1393,170 @@ def suggest_effects(image_analysis, style):
         
         content = response.choices[0].message.content.strip()
         print(f"Raw effects response: {content}")
-        
+
         # Try to parse as JSON, or extract array if enclosed in other text
         try:
             # First attempt: direct JSON parsing
-            effects = json.loads(content)
+            effects = json_loads_fast(content)
             if not isinstance(effects, list):
                 raise ValueError("Response is not a list")
-        except json.JSONDecodeError:
+        except ValueError:
             # Second attempt: try to extract array with regex
-            import re
-            array_match = re.search(r'\[(.*?)\]', content)
+            array_match = _EFFECTS_ARRAY_RE.search(content)
             if array_match:
                 try:
-                    effects = json.loads(f"[{array_match.group(1)}]")
+                    effects = json_loads_fast(f"[{array_match.group(1)}]")
                 except:
                     # Fall back to default effects if all parsing fails
-                    effects = ["zoom", "fade_in", "fade_out", "color_enhance", "slow_motion"]
+                    effects = _DEFAULT_EFFECTS
             else:
                 # Fall back to default effects
-                effects = ["zoom", "fade_in", "fade_out", "color_enhance", "slow_motion"]
+                effects = _DEFAULT_EFFECTS
         
         print(f"Parsed effects: {effects}")
+        if image_hash:
+            openai_cache_set((image_hash, 'suggest_effects', style), effects)
         return effects
     except Exception as e:
         print(f"Error in suggest_effects: {str(e)}")
         # Return default effects rather than an error
-        return ["zoom", "fade_in", "fade_out", "color_enhance", "slow_motion"]
+        return _DEFAULT_EFFECTS
+
+def analyze_script_and_effects(image_path, style, duration, image_hash=None):
+    """
+    Produce the image analysis, video script and effect list in a single
+    OpenAI round trip using JSON mode, instead of three sequential calls.
+
+    Args:
+        image_path (str): Path to the image
+        style (str): Style of the video
+        duration (int): Duration of the video in seconds
+        image_hash (str, optional): Precomputed SHA-256 for the cache key
+
+    Returns:
+        dict: {"analysis": str, "script": str, "effects": list}, or None so
+              the caller can fall back to the separate calls
+    """
+    try:
+        if image_hash:
+            cached = openai_cache_get((image_hash, 'combined', style, duration))
+            if cached is not None:
+                print(f"Using cached combined analysis for {image_hash[:12]}")
+                return cached
+
+        base64_image = encode_image_for_vision(image_path)
+
+        # Whitelisting the implemented effect names in the prompt keeps the
+        # model from inventing names map_effect_name has to guess at
+        effect_names = ", ".join(sorted(set(_EFFECT_MAPPINGS.values())))
+        prompt = (
+            "Analyze this image and plan a short video from it. "
+            "Return a JSON object with exactly these keys:\n"
+            "- analysis: a description of the person's appearance, expression "
+            "and notable features relevant to video generation\n"
+            f"- script: an engaging narration script for a {duration}-second "
+            f"{style} style video based on the image\n"
+            f"- effects: an array of 3-5 effect names chosen only from: {effect_names}"
+        )
+
+        response = openai_client.chat.completions.create(
+            model=OPENAI_MODEL,
+            response_format={"type": "json_object"},
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt},
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:image/jpeg;base64,{base64_image}"
+                            }
+                        }
+                    ]
+                }
+            ],
+            max_tokens=900
+        )
+
+        result = json_loads_fast(response.choices[0].message.content)
+        if not all(k in result for k in ("analysis", "script", "effects")):
+            print("Combined OpenAI response missing keys, falling back to separate calls")
+            return None
+        if not isinstance(result["effects"], list):
+            result["effects"] = _DEFAULT_EFFECTS
+
+        if image_hash:
+            openai_cache_set((image_hash, 'combined', style, duration), result)
+        return result
+    except Exception as e:
+        print(f"Error in combined analysis call: {str(e)}")
+        return None
+
+def _cv_resize_frame(frame, width, height):
+    """
+    Resize one frame with OpenCV's SIMD/multi-threaded kernels instead of
+    MoviePy's per-frame PIL path. INTER_AREA for shrinking, INTER_LINEAR
+    for enlarging.
+    """
+    h = frame.shape[0]
+    interpolation = cv2.INTER_AREA if height < h else cv2.INTER_LINEAR
+    return cv2.resize(frame, (width, height), interpolation=interpolation)
+
+def _cv_colorx_frame(frame, factor):
+    """Vectorized color boost (saturating multiply) via convertScaleAbs"""
+    return cv2.convertScaleAbs(frame, alpha=factor)
+
+# Built once at import - apply_effect used to rebuild this dict of lambdas
+# on every call, several times per video
+_EFFECT_FUNCS = {
+    # These effects are actually available in moviepy
+    "resize": lambda c: c.fl_image(
+        lambda f: _cv_resize_frame(f, int(c.w * 1.5), int(c.h * 1.5))
+    ),  # Instead of zoom
+    "fade_in": lambda c: c.fadein(1),
+    "fade_out": lambda c: c.fadeout(1),
+    "mirror_x": lambda c: c.fx(vfx.mirror_x),
+    "mirror_y": lambda c: c.fx(vfx.mirror_y),
+    "colorx": lambda c: c.fl_image(lambda f: _cv_colorx_frame(f, 1.5)),  # Enhance colors
+    "painting": lambda c: c.fx(vfx.painting, saturation=1.6, black=0.006),
+    "speedx_slow": lambda c: c.fx(vfx.speedx, 0.5),  # Slow motion
+    "speedx_fast": lambda c: c.fx(vfx.speedx, 2.0),  # Fast motion
+    "time_symmetrize": lambda c: c.fx(vfx.time_symmetrize),  # Play forwards then backwards
+    "invert_colors": lambda c: c.fx(vfx.invert_colors),
+    # Fused resize+colorx: one NumPy pass per frame instead of two chained
+    # fl_image transforms (plan_effects substitutes this when both appear)
+    "resize_colorx": lambda c: c.fl_image(
+        lambda f: _cv_resize_frame(_cv_colorx_frame(f, 1.5), int(c.w * 1.5), int(c.h * 1.5))
+    )
+}
+
+# Whitelist of implemented effect names, for O(1) membership checks
+KNOWN_EFFECTS = frozenset(_EFFECT_FUNCS)
 
 def apply_effect(clip, effect_name):
     """Apply a specific effect to a video clip"""
-    effects = {
-        # These effects are actually available in moviepy
-        "resize": lambda c: c.resize(width=c.w*1.5),  # Instead of zoom
-        "fade_in": lambda c: c.fadein(1),
-        "fade_out": lambda c: c.fadeout(1),
-        "mirror_x": lambda c: c.fx(vfx.mirror_x),
-        "mirror_y": lambda c: c.fx(vfx.mirror_y),
-        "colorx": lambda c: c.fx(vfx.colorx, 1.5),  # Enhance colors
-        "painting": lambda c: c.fx(vfx.painting, saturation=1.6, black=0.006),
-        "speedx_slow": lambda c: c.fx(vfx.speedx, 0.5),  # Slow motion
-        "speedx_fast": lambda c: c.fx(vfx.speedx, 2.0),  # Fast motion
-        "time_symmetrize": lambda c: c.fx(vfx.time_symmetrize),  # Play forwards then backwards
-        "invert_colors": lambda c: c.fx(vfx.invert_colors)
-    }
-    
-    if effect_name in effects:
+    if effect_name in _EFFECT_FUNCS:
         try:
             print(f"Applying effect: {effect_name}")
-            return effects[effect_name](clip)
+            return _EFFECT_FUNCS[effect_name](clip)
         except Exception as e:
             print(f"Error applying effect {effect_name}: {str(e)}")
             print(f"Skipping effect {effect_name}")
             return clip
     return clip
 
-def map_effect_name(effect_name):
-    """Map AI-suggested effect names to our implemented effects"""
-    # Define mappings from AI suggestions to implemented effects
-    effect_mappings = {
+# Mappings from AI-suggested effect names to implemented effects, built once
+# at import time since map_effect_name runs per effect per video. Keys are
+# already normalized (lowercase, no separators).
+_EFFECT_NAME_NORM = str.maketrans('', '', '-_ ')
+_EFFECT_MAPPINGS = {
         # Color effects
         "warmtone": "colorx",
-        "warm-color-grading": "colorx",
+        "warmcolorgrading": "colorx",
         "warmorange": "colorx",
         "warmth": "colorx",
         "colorboost": "colorx",
-        "color-boost": "colorx",
         "colorenhance": "colorx",
         "subtleglow": "colorx",
         "vibrant": "colorx",
@@ -458,8 +1565,7 @@ def map_effect_name(effect_name):
         
         # Lens effects
         "softfocus": "painting",
-        "soft-focus": "painting",
-        "lens-blur": "painting",
+        "lensblur": "painting",
         "lensflare": "painting",
         "subtlelensflare": "painting",
         "bokeh": "painting",
@@ -480,57 +1586,225 @@ def map_effect_name(effect_name):
         "vignette": "mirror_x",
         "lightvignette": "mirror_y",
         "subtlevignetting": "mirror_x",
-        "mirror-effect": "mirror_x",
-        "grain-filter": "invert_colors",
+        "mirroreffect": "mirror_x",
+        "grainfilter": "invert_colors",
         "naturalgrain": "invert_colors",
         "smilehighlight": "colorx"
-    }
-    
-    # Normalize effect name (lowercase, remove spaces and dashes)
-    normalized_name = effect_name.lower().replace("-", "").replace("_", "").replace(" ", "")
-    
-    # Return mapped effect if available, or original if not
-    if normalized_name in effect_mappings:
-        mapped_effect = effect_mappings[normalized_name]
+}
+
+def map_effect_name(effect_name):
+    """Map AI-suggested effect names to our implemented effects"""
+    # Normalize effect name (lowercase, strip spaces/dashes/underscores)
+    # in a single translate pass and do one O(1) dict lookup
+    mapped_effect = _EFFECT_MAPPINGS.get(effect_name.lower().translate(_EFFECT_NAME_NORM))
+    if mapped_effect is not None:
         print(f"Mapped effect '{effect_name}' to '{mapped_effect}'")
         return mapped_effect
-    
+
     return effect_name
 
+# Effect pairs that undo each other when the model suggests both
+_CANCELLING_EFFECTS = [("speedx_slow", "speedx_fast")]
+
+def plan_effects(effects):
+    """
+    Map AI-suggested effect names and prune the result before anything is
+    applied: duplicates are dropped, cancelling pairs are removed, and
+    resize+colorx are fused into one per-frame pass. Every entry kept here
+    becomes a lazy MoviePy transform re-executed per frame at encode time,
+    so pruning up front is cheaper than applying and re-rendering.
+
+    Args:
+        effects (list): Raw effect names from the AI
+
+    Returns:
+        list: Implemented effect names, deduplicated and in order
+    """
+    wanted = []
+    seen = set()
+    for effect in effects:
+        mapped_effect = map_effect_name(effect)
+        if mapped_effect not in KNOWN_EFFECTS:
+            print(f"Skipping unknown effect: {effect}")
+        elif mapped_effect not in seen:
+            seen.add(mapped_effect)
+            wanted.append(mapped_effect)
+
+    for first, second in _CANCELLING_EFFECTS:
+        if first in seen and second in seen:
+            print(f"Dropping cancelling effects: {first} + {second}")
+            wanted = [e for e in wanted if e not in (first, second)]
+
+    if "resize" in seen and "colorx" in seen:
+        fuse_at = min(wanted.index("resize"), wanted.index("colorx"))
+        wanted = [e for e in wanted if e not in ("resize", "colorx")]
+        wanted.insert(fuse_at, "resize_colorx")
+
+    return wanted
+
+# ffmpeg -vf equivalents for the effects we can express natively. Speed and
+# time effects are identity transforms on a still image, so they map to None
+# (skipped) in the direct path.
+_FFMPEG_EFFECT_FILTERS = {
+    "resize": "scale=iw*1.5:ih*1.5",
+    "fade_in": "fade=t=in:st=0:d=1",
+    "mirror_x": "hflip",
+    "mirror_y": "vflip",
+    "colorx": "eq=saturation=1.5",
+    "painting": "eq=saturation=1.6",
+    "invert_colors": "negate",
+    "resize_colorx": "scale=iw*1.5:ih*1.5,eq=saturation=1.5",
+    "speedx_slow": None,
+    "speedx_fast": None,
+    "time_symmetrize": None
+}
+
+def build_ffmpeg_filter_chain(effects, duration):
+    """Hashable-argument shim over the cached filter-chain builder"""
+    return _build_ffmpeg_filter_chain(tuple(effects), int(duration))
+
+@functools.lru_cache(maxsize=128)
+def _build_ffmpeg_filter_chain(effects, duration):
+    """
+    Translate mapped effect names into a single ffmpeg -vf filter chain.
+    Memoized - templates and repeat renders rebuild identical chains.
+
+    Args:
+        effects (tuple): AI-suggested effect names
+        duration (int): Video duration, needed to place the fade-out
+
+    Returns:
+        str: The filter chain, always ending with an even-dimension scale
+             and yuv420p format for player compatibility
+    """
+    filters = []
+    applied = 0
+    for mapped_effect in plan_effects(effects):
+        if mapped_effect == "fade_out":
+            filters.append(f"fade=t=out:st={max(0, duration - 1)}:d=1")
+            applied += 1
+        elif mapped_effect in _FFMPEG_EFFECT_FILTERS:
+            f = _FFMPEG_EFFECT_FILTERS[mapped_effect]
+            if f:
+                filters.append(f)
+            applied += 1
+
+    # Same defaults as the MoviePy path when nothing matched
+    if applied == 0:
+        filters = [
+            "fade=t=in:st=0:d=1",
+            "scale=iw*1.5:ih*1.5",
+            "eq=saturation=1.5",
+            f"fade=t=out:st={max(0, duration - 1)}:d=1"
+        ]
+
+    filters.append("scale=trunc(iw/2)*2:trunc(ih/2)*2")
+    filters.append("format=yuv420p")
+    return ",".join(filters)
+
+def create_video_ffmpeg_direct(image_path, duration, effects, background_music, output_path):
+    """
+    Render a single-image video in one native ffmpeg process using -loop 1,
+    bypassing MoviePy's per-frame Python pipeline entirely.
+
+    Returns:
+        dict: The usual create_video result dict on success, or None so the
+              caller can fall back to the MoviePy pipeline
+    """
+    try:
+        has_music = background_music and os.path.exists(background_music)
+
+        cmd = ['-loop', '1', '-i', image_path]
+        if has_music:
+            # Loop the music if it is shorter than the video
+            cmd += ['-stream_loop', '-1', '-i', background_music]
+        cmd += [
+            '-t', str(duration),
+            '-r', '30',
+            '-vf', build_ffmpeg_filter_chain(effects, duration),
+            '-c:v', HW_VIDEO_CODEC,
+            '-b:v', '4000k'
+        ] + direct_encode_args()
+        if has_music:
+            cmd += ['-c:a', 'aac', '-shortest']
+        cmd.append(output_path)
+
+        result = run_ffmpeg(cmd, capture_output=True, text=True)
+        if result.returncode != 0 or not os.path.exists(output_path):
+            print(f"Direct ffmpeg render failed: {result.stderr[-500:]}")
+            return None
+
+        return {
+            "success": True,
+            "output_path": output_path,
+            "filename": os.path.basename(output_path)
+        }
+    except Exception as e:
+        print(f"Error in create_video_ffmpeg_direct: {str(e)}")
+        return None
+
 def create_video(image_path, duration, effects, style, background_music=None):
     """Create a video from a single image with effects"""
+    base_clip = None
+    final_clip = None
+    audio = None
     try:
-        # Create base clip from image
-        base_clip = ImageClip(image_path).set_duration(duration)
-        
-        # Apply effects in sequence
+        # Name the output after a content hash of the inputs - identical
+        # requests then collapse to a stat call instead of a full re-encode
+        try:
+            key_parts = [
+                hash_image_file(image_path),
+                str(int(duration)),
+                ','.join(sorted(map_effect_name(e) for e in effects))
+            ]
+            if background_music and os.path.exists(background_music):
+                key_parts.append(hash_image_file(background_music))
+            cache_key = hashlib.sha256('|'.join(key_parts).encode()).hexdigest()[:16]
+            output_filename = f"video_{cache_key}.mp4"
+        except Exception as e:
+            print(f"Could not build video cache key: {e}")
+            output_filename = f"video_{os.path.basename(image_path)}_{int(duration)}s.mp4"
+        output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
+
+        if os.path.exists(output_path):
+            print(f"Reusing cached video: {output_path}")
+            return {
+                "success": True,
+                "output_path": output_path,
+                "filename": output_filename
+            }
+
+        # Fast path: a still image plus filters is something ffmpeg can do
+        # natively in one process instead of piping 30 fps of Python frames
+        direct_result = create_video_ffmpeg_direct(image_path, duration, effects, background_music, output_path)
+        if direct_result is not None:
+            return direct_result
+
+        # Decode once with OpenCV and hand MoviePy the RGB view - ImageClip
+        # would otherwise re-parse the JPEG through PIL
+        source_img = cv2.imread(image_path)
+        if source_img is not None:
+            base_clip = ImageClip(np.ascontiguousarray(
+                cv2.cvtColor(source_img, cv2.COLOR_BGR2RGB)
+            )).set_duration(duration)
+        else:
+            base_clip = ImageClip(image_path).set_duration(duration)
+
+        # Apply effects in sequence, pruned of duplicates and cancelling
+        # pairs so each surviving entry is a per-frame transform that earns
+        # its keep at encode time
         final_clip = base_clip
-        
-        # Apply at least some default effects if none of the suggested ones match
-        applied_effects = 0
-        for effect in effects:
-            # Map the effect name to our implemented effects
-            mapped_effect = map_effect_name(effect)
-            
-            if mapped_effect in ["resize", "fade_in", "fade_out", "mirror_x", "mirror_y", 
-                              "colorx", "painting", "speedx_slow", "speedx_fast",
-                              "time_symmetrize", "invert_colors"]:
-                final_clip = apply_effect(final_clip, mapped_effect)
-                applied_effects += 1
-            else:
-                print(f"Skipping unknown effect: {effect}")
-        
+        planned_effects = plan_effects(effects)
+        for mapped_effect in planned_effects:
+            final_clip = apply_effect(final_clip, mapped_effect)
+
         # If no effects were applied, use some defaults
-        if applied_effects == 0:
+        if not planned_effects:
             print("No matching effects found, applying default effects")
             final_clip = apply_effect(final_clip, "fade_in")
-            final_clip = apply_effect(final_clip, "resize")
-            final_clip = apply_effect(final_clip, "colorx")
+            final_clip = apply_effect(final_clip, "resize_colorx")
             final_clip = apply_effect(final_clip, "fade_out")
         
-        # Initialize audio to None
-        audio = None
-        
         # Add background music if provided
         if background_music and os.path.exists(background_music):
             audio = AudioFileClip(background_music)
@@ -538,37 +1812,125 @@ def create_video(image_path, duration, effects, style, background_music=None):
                 audio = audio.loop(duration=duration)
             final_clip = final_clip.set_audio(audio)
         
-        # Generate output filename
-        output_filename = f"video_{os.path.basename(image_path)}_{int(duration)}s.mp4"
-        output_path = os.path.join(app.config['OUTPUT_FOLDER'], output_filename)
-        
-        # Write final video
+        # Write final video with the hardware encoder when one is available
         final_clip.write_videofile(
             output_path,
             fps=30,
             bitrate="4000k",
-            codec='libx264',
-            audio_codec='aac'
+            codec=HW_VIDEO_CODEC,
+            audio_codec='aac',
+            ffmpeg_params=hw_codec_ffmpeg_params(),
+            **hw_codec_write_kwargs()
         )
-        
-        # Clean up
-        final_clip.close()
-        # Only close audio if it was initialized
-        if audio is not None:
-            audio.close()
-        
+
         return {
             "success": True,
             "output_path": output_path,
             "filename": output_filename
         }
-        
+
     except Exception as e:
         print(f"Error in create_video: {str(e)}")
         return {
             "success": False,
             "error": str(e)
         }
+    finally:
+        # Always release the readers, even on failure
+        for clip in (final_clip, audio, base_clip):
+            try:
+                if clip is not None:
+                    clip.close()
+            except Exception:
+                pass
+
+# ElevenLabs synthesis time grows roughly linearly with text length, so long
+# scripts are split into sentence-aligned chunks and synthesized in parallel
+TTS_CHUNK_CHAR_LIMIT = 250
+TTS_MAX_PARALLEL_REQUESTS = 4
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+def split_text_for_tts(text, char_limit=TTS_CHUNK_CHAR_LIMIT):
+    """
+    Split a script into sentence-aligned chunks of roughly char_limit
+    characters so they can be synthesized concurrently.
+    """
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_SPLIT_RE.split(text.strip()):
+        if current and len(current) + len(sentence) + 1 > char_limit:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        chunks.append(current)
+    return chunks
+
+def synthesize_elevenlabs_chunk(text, voice_id, chunk_path):
+    """
+    Synthesize one piece of text with ElevenLabs, streaming the MP3 to
+    chunk_path. Audio quality stays at the API default; set
+    ELEVEN_TTS_OUTPUT_FORMAT (e.g. mp3_22050_32) to trade fidelity for
+    smaller, faster responses.
+
+    Returns:
+        bool: True if the chunk was written successfully
+    """
+    try:
+        headers = {
+            "xi-api-key": ELEVEN_LABS_API_KEY,
+            "Content-Type": "application/json"
+        }
+        data = {
+            "text": text,
+            "model_id": "eleven_monolingual_v1",
+            "voice_settings": {
+                "stability": 0.5,
+                "similarity_boost": 0.75
+            }
+        }
+        params = {}
+        if ELEVEN_TTS_OUTPUT_FORMAT:
+            params["output_format"] = ELEVEN_TTS_OUTPUT_FORMAT
+        response = elevenlabs_requests.post(
+            f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream",
+            params=params,
+            headers=headers,
+            json=data,
+            stream=True
+        )
+        if response.status_code == 200:
+            # C-level copy with 64 KiB reads instead of a 4 KB Python loop
+            with open(chunk_path, "wb") as f:
+                shutil.copyfileobj(response.raw, f, length=1 << 16)
+            return True
+        print(f"Error generating speech with Eleven Labs: {response.text}")
+        return False
+    except Exception as e:
+        print(f"Error synthesizing TTS chunk: {str(e)}")
+        return False
+
+def concat_audio_chunks(chunk_paths, output_path):
+    """Losslessly join MP3 chunks with ffmpeg's concat demuxer"""
+    concat_list = f"{output_path}.concat.txt"
+    try:
+        with open(concat_list, 'w') as f:
+            for path in chunk_paths:
+                f.write(f"file '{os.path.abspath(path)}'\n")
+        run_ffmpeg(
+            ['-f', 'concat', '-safe', '0',
+             '-i', concat_list, '-c', 'copy', output_path],
+            check=True, capture_output=True
+        )
+        return True
+    except Exception as e:
+        print(f"Error concatenating TTS chunks: {str(e)}")
+        return False
+    finally:
+        for path in chunk_paths + [concat_list]:
+            if os.path.exists(path):
+                os.remove(path)
 
 def generate_tts_audio(text, voice="en-US-Neural2-F", output_path=None, voice_file=None):
     """
@@ -585,38 +1947,30 @@ def generate_tts_audio(text, voice="en-US-Neural2-F", output_path=None, voice_fi
     """
     if not output_path:
         os.makedirs('temp', exist_ok=True)
-        output_path = f"temp/tts_{int(time.time())}.mp3"
+        # Concurrent jobs synthesize TTS in parallel now, so a
+        # second-resolution timestamp would let two jobs swap voiceovers
+        output_path = f"temp/tts_{uuid.uuid4().hex}.mp3"
     
     try:
         # If a custom voice file is provided, use Eleven Labs for voice cloning
         if voice_file and os.path.exists(voice_file):
             print(f"Using custom voice file: {voice_file}")
             try:
-                # First, check if we already have a voice ID for this file
-                voice_id = None
+                # Check the persistent map for a previously cloned voice
+                # before touching the ElevenLabs API
                 voice_name = os.path.basename(voice_file).split('.')[0]
-                
-                # Try to get existing voice or create new one
-                try:
-                    # Check if we have existing voices
-                    headers = {
-                        "xi-api-key": ELEVEN_LABS_API_KEY
-                    }
-                    response = elevenlabs_requests.get(
-                        "https://api.elevenlabs.io/v1/voices",
-                        headers=headers
-                    )
-                    voices = response.json().get("voices", [])
-                    
-                    # Check if we already have this voice
-                    for v in voices:
-                        if v["name"] == voice_name:
-                            voice_id = v["voice_id"]
-                            print(f"Using existing voice ID: {voice_id}")
-                            break
-                    
-                    # If not found, create a new voice
-                    if not voice_id:
+                with open(voice_file, 'rb') as f:
+                    voice_sha = hashlib.sha256(f.read()).hexdigest()
+                voice_id = voice_id_map.get(voice_sha)
+
+                if voice_id:
+                    print(f"Using existing voice ID: {voice_id}")
+                else:
+                    # New voice file - clone it and remember the ID
+                    try:
+                        headers = {
+                            "xi-api-key": ELEVEN_LABS_API_KEY
+                        }
                         print("Creating new voice with Eleven Labs")
                         with open(voice_file, "rb") as f:
                             files = {
@@ -635,39 +1989,38 @@ def generate_tts_audio(text, voice="en-US-Neural2-F", output_path=None, voice_fi
                             if response.status_code == 200:
                                 voice_id = response.json().get("voice_id")
                                 print(f"Created new voice ID: {voice_id}")
+                                save_voice_id(voice_sha, voice_id)
+                                invalidate_elevenlabs_voices()
                             else:
                                 print(f"Error creating voice: {response.text}")
-                except Exception as e:
-                    print(f"Error accessing Eleven Labs API: {str(e)}")
+                    except Exception as e:
+                        print(f"Error accessing Eleven Labs API: {str(e)}")
                 
                 # If we have a voice ID, generate speech
                 if voice_id:
-                    # Generate speech with the voice
-                    headers = {
-                        "xi-api-key": ELEVEN_LABS_API_KEY,
-                        "Content-Type": "application/json"
-                    }
-                    data = {
-                        "text": text,
-                        "model_id": "eleven_monolingual_v1",
-                        "voice_settings": {
-                            "stability": 0.5,
-                            "similarity_boost": 0.75
-                        }
-                    }
-                    response = elevenlabs_requests.post(
-                        f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
-                        headers=headers,
-                        json=data
-                    )
-                    
-                    if response.status_code == 200:
-                        with open(output_path, "wb") as f:
-                            f.write(response.content)
-                        print(f"Generated TTS audio using Eleven Labs: {output_path}")
-                        return {"success": True, "audio_path": output_path}
+                    text_chunks = split_text_for_tts(text)
+
+                    if len(text_chunks) <= 1:
+                        # Short script - single streaming request
+                        if synthesize_elevenlabs_chunk(text, voice_id, output_path):
+                            print(f"Generated TTS audio using Eleven Labs: {output_path}")
+                            return {"success": True, "audio_path": output_path}
                     else:
-                        print(f"Error generating speech with Eleven Labs: {response.text}")
+                        # Long script - synthesize sentence chunks in
+                        # parallel, then join them losslessly
+                        chunk_paths = [f"{output_path}.part{i}.mp3" for i in range(len(text_chunks))]
+                        with ThreadPoolExecutor(max_workers=TTS_MAX_PARALLEL_REQUESTS) as pool:
+                            results = list(pool.map(
+                                lambda pair: synthesize_elevenlabs_chunk(pair[0], voice_id, pair[1]),
+                                zip(text_chunks, chunk_paths)
+                            ))
+                        if all(results) and concat_audio_chunks(chunk_paths, output_path):
+                            print(f"Generated TTS audio using Eleven Labs ({len(text_chunks)} chunks): {output_path}")
+                            return {"success": True, "audio_path": output_path}
+                        # Clean up any partial chunks before falling back
+                        for path in chunk_paths:
+                            if os.path.exists(path):
+                                os.remove(path)
                 
                 # If Eleven Labs fails or no voice ID, fall back to using the voice file directly
                 shutil.copy(voice_file, output_path)
@@ -688,13 +2041,35 @@ def generate_tts_audio(text, voice="en-US-Neural2-F", output_path=None, voice_fi
             return {"success": True, "audio_path": output_path}
         except ImportError:
             print("gTTS not installed, using silent audio fallback")
-            # Create a silent audio file based on text length
-            from moviepy.editor import AudioClip
+            # Create a silent audio file based on text length. ffmpeg's
+            # anullsrc source generates this natively in one shot instead of
+            # MoviePy evaluating a Python lambda per audio sample
             words = len(text.split())
-            duration = max(3, words * 0.3)  # Estimate 0.3 seconds per word, minimum 3 seconds
-            
-            silent_audio = AudioClip(lambda t: 0, duration=duration)
-            silent_audio.write_audiofile(output_path, fps=44100)
+            duration = max(3, int(round(words * 0.3)))  # Estimate 0.3 seconds per word, minimum 3 seconds
+
+            # Silence of a given length never changes - generate it once
+            # per duration and copy, instead of spawning ffmpeg every time
+            cached_silence = os.path.join('temp', f"silence_{duration}s.mp3")
+            if not os.path.exists(cached_silence):
+                # Write to a unique temp name and rename so concurrent
+                # jobs never interleave writes into one file - with a
+                # fixed .tmp name, two workers generating the same
+                # duration would corrupt the cache for everyone after
+                fd, tmp_path = tempfile.mkstemp(suffix='.mp3', dir='temp')
+                os.close(fd)
+                try:
+                    run_ffmpeg(
+                        ['-f', 'lavfi', '-i', 'anullsrc=r=44100:cl=mono',
+                         '-t', str(duration), '-c:a', 'libmp3lame', '-q:a', '9',
+                         '-f', 'mp3', tmp_path],
+                        check=True, capture_output=True
+                    )
+                    os.replace(tmp_path, cached_silence)
+                except Exception:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            shutil.copyfile(cached_silence, output_path)
             print(f"Created silent audio file: {output_path}")
             return {"success": True, "audio_path": output_path}
     
@@ -702,41 +2077,181 @@ def generate_tts_audio(text, voice="en-US-Neural2-F", output_path=None, voice_fi
         print(f"Error generating TTS audio: {str(e)}")
         return {"success": False, "error": str(e)}
 
-def add_voiceover_to_video(video_path, script_text, output_path=None, voice_file=None):
+class ClipPool:
+    """
+    Small LRU pool of MoviePy clip readers keyed by path. Every
+    VideoFileClip/AudioFileClip open spawns a fresh ffmpeg subprocess
+    (~200-500 ms), so repeat access to the same file is pooled instead.
+    Clips are handed out exclusively and returned with put().
+    """
+    def __init__(self, max_size=8):
+        self._clips = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_size = max_size
+
+    def get(self, path, clip_class):
+        """Borrow a pooled reader for path, opening a new one on a miss"""
+        with self._lock:
+            clip = self._clips.pop(path, None)
+        if clip is not None:
+            return clip
+        return clip_class(path)
+
+    def put(self, path, clip):
+        """Return a reader to the pool, evicting the oldest when full"""
+        with self._lock:
+            self._clips[path] = clip
+            evicted = []
+            while len(self._clips) > self._max_size:
+                _, oldest = self._clips.popitem(last=False)
+                evicted.append(oldest)
+        for clip in evicted:
+            try:
+                clip.close()
+            except Exception:
+                pass
+
+clip_pool = ClipPool()
+
+def media_duration(path):
+    """
+    Read a media file's duration with ffprobe, without spawning a full
+    MoviePy reader pipeline.
+
+    Returns:
+        float: Duration in seconds, or None if it could not be read
+    """
+    try:
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+             '-of', 'default=noprint_wrappers=1:nokey=1', path],
+            capture_output=True, text=True, timeout=15
+        )
+        if result.returncode == 0:
+            return float(result.stdout.strip())
+    except Exception as e:
+        print(f"Could not probe duration of {path}: {e}")
+    return None
+
+def add_voiceover_to_video(video_path, script_text, output_path=None, voice_file=None, tts_result=None):
     """
     Adds a voiceover to a video.
-    
+
     Args:
         video_path (str): Path to the video file
         script_text (str): Text for the voiceover
         output_path (str, optional): Path to save the output video
         voice_file (str, optional): Path to a custom voice file
-        
+        tts_result (dict, optional): Result of an already-finished
+            generate_tts_audio call, so synthesis can overlap the render
+
     Returns:
         str: Path to the output video
     """
     if not output_path:
         output_path = video_path
-    
+
+    # Track the source readers so they are always released - leaked MoviePy
+    # readers accumulate ffmpeg subprocesses and file descriptors in a
+    # long-running worker
+    source_video = None
+    source_audio = None
+    audio_path = None
+
     try:
-        # Generate TTS audio
-        tts_result = generate_tts_audio(script_text, voice_file=voice_file)
+        # Generate TTS audio unless the caller already synthesized it
+        if tts_result is None:
+            tts_result = generate_tts_audio(script_text, voice_file=voice_file)
         if not tts_result["success"]:
             print(f"Warning: Voiceover could not be generated: {tts_result.get('error', 'Unknown error')}")
             return {"success": False, "error": tts_result.get("error", "Unknown error in TTS generation")}
-        
+
         audio_path = tts_result["audio_path"]
-        
-        # Load the video and audio
-        video = VideoFileClip(video_path)
-        audio = AudioFileClip(audio_path)
-        
-        # Check the durations
-        video_duration = video.duration
-        audio_duration = audio.duration
+
+        # Probe durations with ffprobe - the direct ffmpeg paths below
+        # never need decoded MoviePy readers at all
+        video_duration = media_duration(video_path)
+        audio_duration = media_duration(audio_path)
+        if video_duration is None or audio_duration is None:
+            # Borrow pooled readers instead of spawning fresh ffmpeg processes
+            source_video = clip_pool.get(video_path, VideoFileClip)
+            source_audio = clip_pool.get(audio_path, AudioFileClip)
+            video_duration = source_video.duration
+            audio_duration = source_audio.duration
 
         print(f"Video duration: {video_duration}s, Audio duration: {audio_duration}s")
-        
+
+        # When no speed adjustment is needed, the video stream can be copied
+        # as-is: a pure ffmpeg mux instead of decoding and re-encoding every
+        # frame just to attach an audio track
+        needs_speed_change = (
+            audio_duration > video_duration
+            and (video_duration / audio_duration) > 0.5
+        )
+        if not needs_speed_change:
+            mux_target = output_path
+            temp_output = None
+            if output_path == video_path:
+                # Can't read and overwrite the same file in one pass
+                temp_output = f"{output_path}.mux.mp4"
+                mux_target = temp_output
+
+            result = run_ffmpeg(
+                ['-i', video_path, '-i', audio_path,
+                 '-map', '0:v:0', '-map', '1:a:0',
+                 '-c:v', 'copy', '-c:a', 'aac', '-b:a', '128k',
+                 '-shortest', '-movflags', '+faststart', mux_target],
+                capture_output=True, text=True
+            )
+            if result.returncode == 0 and os.path.exists(mux_target):
+                if temp_output:
+                    os.replace(temp_output, output_path)
+                print(f"Muxed voiceover without re-encoding: {output_path}")
+                return {"success": True, "video_path": output_path}
+
+            print(f"Stream-copy mux failed, falling back to MoviePy: {result.stderr[-300:]}")
+            if temp_output and os.path.exists(temp_output):
+                os.remove(temp_output)
+
+        else:
+            # The video has to be slowed to match the audio, so a re-encode
+            # is unavoidable - do it in one ffmpeg pass with hardware decode
+            # (frames stay off the Python heap) instead of MoviePy
+            speed_factor = video_duration / audio_duration
+            mux_target = output_path
+            temp_output = None
+            if output_path == video_path:
+                temp_output = f"{output_path}.retime.mp4"
+                mux_target = temp_output
+
+            hwaccel = 'cuda' if HW_VIDEO_CODEC == 'h264_nvenc' else 'auto'
+            result = run_ffmpeg(
+                ['-hwaccel', hwaccel, '-i', video_path, '-i', audio_path,
+                 '-filter_complex', f"[0:v]setpts=PTS/{speed_factor}[v]",
+                 '-map', '[v]', '-map', '1:a:0',
+                 '-c:v', HW_VIDEO_CODEC, '-b:v', '4000k',
+                 '-c:a', 'aac', '-b:a', '128k',
+                 '-shortest', '-movflags', '+faststart', mux_target],
+                capture_output=True, text=True
+            )
+            if result.returncode == 0 and os.path.exists(mux_target):
+                if temp_output:
+                    os.replace(temp_output, output_path)
+                print(f"Re-timed video to voiceover length in one ffmpeg pass: {output_path}")
+                return {"success": True, "video_path": output_path}
+
+            print(f"Hardware re-time failed, falling back to MoviePy: {result.stderr[-300:]}")
+            if temp_output and os.path.exists(temp_output):
+                os.remove(temp_output)
+
+        # MoviePy fallback - only now do we need decoded readers
+        if source_video is None:
+            source_video = clip_pool.get(video_path, VideoFileClip)
+        if source_audio is None:
+            source_audio = clip_pool.get(audio_path, AudioFileClip)
+        video = source_video
+        audio = source_audio
+
         # If audio is longer than video, make the video slower to match
         if audio_duration > video_duration:
             print(f"Audio is longer than video. Extending video duration.")
@@ -752,72 +2267,262 @@ def add_voiceover_to_video(video_path, script_text, output_path=None, voice_file
         # Set the audio (this will use the audio duration which might be shorter than the video)
         final_video = video.set_audio(audio)
         
-        # Write the output
-        final_video.write_videofile(output_path, codec='libx264', audio_codec='aac')
-        
-        # Clean up
-        video.close()
-        audio.close()
-        final_video.close()
-        
+        # Write the output with the hardware encoder when one is available
+        final_video.write_videofile(
+            output_path,
+            codec=HW_VIDEO_CODEC,
+            audio_codec='aac',
+            ffmpeg_params=hw_codec_ffmpeg_params(),
+            **hw_codec_write_kwargs()
+        )
+
         # Don't remove the audio file yet as it might be needed later
         # if os.path.exists(audio_path):
         #     os.remove(audio_path)
-            
+
         return {"success": True, "video_path": output_path}
-    
+
     except Exception as e:
         error_msg = f"Error adding voiceover: {str(e)}"
         print(error_msg)
         return {"success": False, "error": error_msg}
+    finally:
+        # Return the source readers to the pool - unless their file was just
+        # overwritten, in which case the pooled reader would be stale
+        if source_video is not None:
+            if video_path != output_path:
+                clip_pool.put(video_path, source_video)
+            else:
+                try:
+                    source_video.close()
+                except Exception:
+                    pass
+        if source_audio is not None:
+            clip_pool.put(audio_path, source_audio)
+
+def create_template_video_ffmpeg_direct(template, image_path, script, duration, output_path, img=None):
+    """
+    Render a template video (still image + effect chain + caption overlay)
+    in one native ffmpeg process, skipping MoviePy's per-frame Python
+    callbacks entirely.
+
+    Args:
+        img: Optional pre-decoded image array, to avoid a second imread
+
+    Returns:
+        True on success, or None so the caller can fall back to MoviePy
+    """
+    caption_path = None
+    try:
+        if img is None:
+            img = cv2.imread(image_path)
+        if img is None:
+            return None
+        frame_w, frame_h = img.shape[1], img.shape[0]
+        if "resize" in template["effects"]:
+            frame_w, frame_h = int(frame_w * 1.5), int(frame_h * 1.5)
+
+        chain = build_ffmpeg_filter_chain(template["effects"], duration)
+        cmd = ['-loop', '1', '-i', image_path]
+
+        if script and len(script) > 0 and PILImage is not None:
+            short_text = script[:100] + "..." if len(script) > 100 else script
+            arr = _render_caption(short_text, 30, int(frame_w * 0.8), 'white', (0, 0, 0, 128))
+            if arr is not None:
+                fd, caption_path = tempfile.mkstemp(suffix='.png')
+                os.close(fd)
+                PILImage.fromarray(arr).save(caption_path)
+                cmd += ['-i', caption_path]
+                if template["text_position"] == "top":
+                    y_expr = "50"
+                elif template["text_position"] == "bottom":
+                    y_expr = "H-h-50"
+                else:
+                    y_expr = "(H-h)/2"
+                # Re-pin the pixel format after overlay - compositing the
+                # RGBA caption can promote the stream to a format the
+                # hardware encoders reject
+                cmd += ['-filter_complex',
+                        f"[0:v]{chain}[v];[v][1:v]overlay=(W-w)/2:{y_expr},format=yuv420p"]
+            else:
+                cmd += ['-vf', chain]
+        else:
+            cmd += ['-vf', chain]
+
+        cmd += [
+            '-t', str(duration),
+            '-r', '30',
+            '-c:v', HW_VIDEO_CODEC,
+            '-b:v', '4000k'
+        ] + direct_encode_args() + [output_path]
+
+        result = run_ffmpeg(cmd, capture_output=True, text=True)
+        if result.returncode != 0 or not os.path.exists(output_path):
+            print(f"Direct template render failed: {result.stderr[-500:]}")
+            return None
+        return True
+    except Exception as e:
+        print(f"Error in create_template_video_ffmpeg_direct: {str(e)}")
+        return None
+    finally:
+        if caption_path and os.path.exists(caption_path):
+            os.remove(caption_path)
+
+@functools.lru_cache(maxsize=256)
+def _render_caption(text, fontsize, width, color, bg_rgba):
+    """
+    Rasterize a caption to an RGBA numpy array with PIL. Memoized so
+    identical overlays render once instead of once per video.
+
+    Args:
+        text: Caption text
+        fontsize: Font size in pixels
+        width: Maximum caption width in pixels
+        color: Text color name or hex string
+        bg_rgba: Background color as an (r, g, b, a) tuple
+
+    Returns:
+        numpy array (H, W, 4), or None if Pillow is unavailable
+    """
+    if PILImage is None:
+        return None
+    try:
+        font = PILImageFont.truetype("DejaVuSans-Bold.ttf", fontsize)
+    except OSError:
+        font = PILImageFont.load_default()
+    # Wrap to fit the requested width, estimating characters per line from
+    # the average glyph width
+    probe = PILImageDraw.Draw(PILImage.new("RGBA", (1, 1)))
+    avg_char = max(1, probe.textlength("The quick brown fox", font=font) / 19)
+    lines = []
+    for paragraph in text.split("\n"):
+        lines.extend(textwrap.wrap(paragraph, width=max(1, int(width / avg_char))) or [""])
+    line_height = int(fontsize * 1.3)
+    padding = int(fontsize * 0.4)
+    height = line_height * len(lines) + 2 * padding
+    img = PILImage.new("RGBA", (int(width), height), bg_rgba)
+    draw = PILImageDraw.Draw(img)
+    for i, line in enumerate(lines):
+        line_width = draw.textlength(line, font=font)
+        draw.text(((width - line_width) / 2, padding + i * line_height), line, font=font, fill=color)
+    return np.array(img)
+
+def make_caption_clip(text, fontsize, width, duration, color='white', bg_rgba=(0, 0, 0, 128)):
+    """
+    Build a caption overlay clip, preferring the cached PIL renderer and
+    falling back to ImageMagick-backed TextClip.
+    """
+    arr = _render_caption(text, fontsize, int(width), color, bg_rgba)
+    if arr is not None:
+        rgb = arr[:, :, :3]
+        mask = ImageClip(arr[:, :, 3] / 255.0, ismask=True)
+        return ImageClip(rgb).set_mask(mask).set_duration(duration)
+    return TextClip(
+        text,
+        fontsize=fontsize,
+        color=color,
+        bg_color='rgba(0,0,0,0.5)',
+        method='caption',
+        size=(width, None)
+    ).set_duration(duration)
+
+# Template definitions with simpler effects, built once at import instead
+# of reconstructed per call
+_TEMPLATES = {
+    "social_story": {
+        "effects": ["fade_in", "resize", "colorx", "fade_out"],
+        "text_position": "bottom",
+        "has_voiceover": True,
+        "transitions": ["fade"]
+    },
+    "product_showcase": {
+        "effects": ["fade_in", "resize", "mirror_x", "colorx", "fade_out"],
+        "text_position": "top",
+        "has_voiceover": True,
+        "transitions": ["slide"]
+    },
+    "dynamic_ad": {
+        "effects": ["speedx_fast", "colorx", "mirror_x", "fade_out"],  # Removed painting and time_symmetrize
+        "text_position": "center",
+        "has_voiceover": True,
+        "transitions": ["zoom"]
+    },
+    "cinematic": {
+        "effects": ["fade_in", "mirror_x", "colorx", "fade_out"],  # Removed painting and time_symmetrize
+        "text_position": "bottom",
+        "has_voiceover": True,
+        "transitions": ["fade"]
+    }
+}
 
 def create_video_from_template(template_name, image_path, script, style, duration=15):
     """Create a video using a predefined template"""
     try:
-        # Define templates with simpler effects
-        templates = {
-            "social_story": {
-                "effects": ["fade_in", "resize", "colorx", "fade_out"],
-                "text_position": "bottom",
-                "has_voiceover": True,
-                "transitions": ["fade"]
-            },
-            "product_showcase": {
-                "effects": ["fade_in", "resize", "mirror_x", "colorx", "fade_out"],
-                "text_position": "top",
-                "has_voiceover": True,
-                "transitions": ["slide"]
-            },
-            "dynamic_ad": {
-                "effects": ["speedx_fast", "colorx", "mirror_x", "fade_out"],  # Removed painting and time_symmetrize
-                "text_position": "center",
-                "has_voiceover": True,
-                "transitions": ["zoom"]
-            },
-            "cinematic": {
-                "effects": ["fade_in", "mirror_x", "colorx", "fade_out"],  # Removed painting and time_symmetrize
-                "text_position": "bottom",
-                "has_voiceover": True,
-                "transitions": ["fade"]
-            }
-        }
-        
         # Check if template exists
-        if template_name not in templates:
+        template = _TEMPLATES.get(template_name)
+        if template is None:
             return {
-                "success": False, 
-                "error": f"Template '{template_name}' not found. Available templates: {list(templates.keys())}"
+                "success": False,
+                "error": f"Template '{template_name}' not found. Available templates: {list(_TEMPLATES.keys())}"
             }
-        
-        template = templates[template_name]
-        
-        # Create base clip from image
-        base_clip = ImageClip(image_path).set_duration(duration)
-        
-        # Apply template effects
+
+        # Name the output after a content hash of the inputs, as in
+        # create_video - the script is part of the key since it drives the
+        # caption and the voiceover
+        try:
+            key_parts = [
+                hash_image_file(image_path),
+                template_name,
+                str(int(duration)),
+                hashlib.sha256((script or '').encode()).hexdigest()
+            ]
+            cache_key = hashlib.sha256('|'.join(key_parts).encode()).hexdigest()[:16]
+            output_filename = f"{template_name}_{cache_key}.mp4"
+        except Exception as e:
+            print(f"Could not build template cache key: {e}")
+            output_filename = f"{template_name}_{os.path.basename(image_path)}_{int(duration)}s.mp4"
+        output_path = os.path.join("output", output_filename)
+
+        if os.path.exists(output_path):
+            print(f"Reusing cached template video: {output_path}")
+            return {
+                "success": True,
+                "output_path": output_path,
+                "filename": output_filename,
+                "template": template_name
+            }
+
+        # Decode the image once; both the direct path and the MoviePy
+        # fallback reuse the same array instead of re-running the IDCT
+        source_img = cv2.imread(image_path)
+        source_rgb = None
+        if source_img is not None:
+            source_rgb = np.ascontiguousarray(cv2.cvtColor(source_img, cv2.COLOR_BGR2RGB))
+
+        # Fast path: compile the effect list and caption into one ffmpeg
+        # filtergraph instead of running Python callbacks per frame
+        if create_template_video_ffmpeg_direct(template, image_path, script, duration, output_path, img=source_img):
+            if template["has_voiceover"] and script and len(script) > 0:
+                voiceover_result = add_voiceover_to_video(output_path, script, output_path)
+                if not voiceover_result["success"]:
+                    print(f"Warning: Voiceover could not be added: {voiceover_result['error']}")
+            return {
+                "success": True,
+                "output_path": output_path,
+                "filename": output_filename,
+                "template": template_name
+            }
+
+        # Create base clip from the already-decoded frame when we have it
+        if source_rgb is not None:
+            base_clip = ImageClip(source_rgb).set_duration(duration)
+        else:
+            base_clip = ImageClip(image_path).set_duration(duration)
+
+        # Apply template effects, pruned and fused like the other paths
         final_clip = base_clip
-        for effect in template["effects"]:
-            final_clip = apply_effect(final_clip, effect)
+        for mapped_effect in plan_effects(template["effects"]):
+            final_clip = apply_effect(final_clip, mapped_effect)
         
         # Add text overlay
         if script and len(script) > 0:
@@ -825,15 +2530,14 @@ def create_video_from_template(template_name, image_path, script, style, duratio
                 # Create a short version for the overlay
                 short_text = script[:100] + "..." if len(script) > 100 else script
                 
-                # Try to create text clip - this requires ImageMagick
-                text_clip = TextClip(
-                    short_text, 
-                    fontsize=30, 
-                    color='white', 
-                    bg_color='rgba(0,0,0,0.5)',
-                    method='caption', 
-                    size=(final_clip.w * 0.8, None)
-                ).set_duration(duration)
+                # Render the caption in-process (cached), avoiding the
+                # ImageMagick subprocess TextClip shells out to
+                text_clip = make_caption_clip(
+                    short_text,
+                    fontsize=30,
+                    width=final_clip.w * 0.8,
+                    duration=duration
+                )
                 
                 # Position the text based on template
                 if template["text_position"] == "top":
@@ -852,27 +2556,51 @@ def create_video_from_template(template_name, image_path, script, style, duratio
                 print("Proceeding without text overlay...")
                 # Continue without text overlay
         
-        # Generate output filename
-        output_filename = f"{template_name}_{os.path.basename(image_path)}_{int(duration)}s.mp4"
-        output_path = os.path.join("output", output_filename)
-        
-        # Write the video
+        # Generate the voiceover up front so the audio rides along in the
+        # same encode pass instead of re-encoding the whole video afterwards
+        voiceover_audio = None
+        needs_two_pass_voiceover = False
+        if template["has_voiceover"] and script and len(script) > 0:
+            tts_result = generate_tts_audio(script)
+            if tts_result["success"]:
+                try:
+                    voiceover_audio = AudioFileClip(tts_result["audio_path"])
+                    if voiceover_audio.duration > final_clip.duration:
+                        # Audio is longer than the video - let the two-pass
+                        # path handle the speed matching
+                        voiceover_audio.close()
+                        voiceover_audio = None
+                        needs_two_pass_voiceover = True
+                    else:
+                        final_clip = final_clip.set_audio(voiceover_audio)
+                except Exception as e:
+                    print(f"Warning: could not attach voiceover audio: {str(e)}")
+                    needs_two_pass_voiceover = True
+            else:
+                print(f"Warning: Voiceover could not be generated: {tts_result.get('error', 'Unknown error')}")
+
+        # Write the video with the hardware encoder when one is available
         final_clip.write_videofile(
             output_path,
             fps=30,
             bitrate="4000k",
-            codec='libx264',
-            audio_codec='aac'
+            codec=HW_VIDEO_CODEC,
+            audio_codec='aac',
+            ffmpeg_params=hw_codec_ffmpeg_params(),
+            **hw_codec_write_kwargs()
         )
-        
-        # Add voiceover if specified
-        if template["has_voiceover"] and script and len(script) > 0:
+
+        # Fall back to the re-encode path only when the fused write could
+        # not carry the voiceover
+        if needs_two_pass_voiceover:
             voiceover_result = add_voiceover_to_video(output_path, script, output_path)
             if not voiceover_result["success"]:
                 print(f"Warning: Voiceover could not be added: {voiceover_result['error']}")
-        
+
         # Clean up
         final_clip.close()
+        if voiceover_audio is not None:
+            voiceover_audio.close()
         
         return {
             "success": True,
@@ -899,15 +2627,19 @@ def generate_video_from_text(text_prompt, duration=15, style="casual"):
     """
     try:
         os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-        output_filename = f"text_video_{int(time.time())}.mp4"
+        # Content-addressed output: the same (prompt, duration, style)
+        # returns the already-downloaded video instead of a fresh DEEPA
+        # generation plus polling plus download
+        cache_key = hashlib.sha256(
+            f"{text_prompt}|{int(duration)}|{style}".encode()
+        ).hexdigest()[:16]
+        output_filename = f"text_video_{cache_key}.mp4"
         output_path = os.path.join(OUTPUT_FOLDER, output_filename)
-        
-        # Call DEEPA API to generate video
-        headers = {
-            "Authorization": f"Bearer {DEEPA_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
+
+        if os.path.exists(output_path):
+            print(f"Reusing cached text-to-video output: {output_path}")
+            return {"success": True, "video_path": output_path}
+
         # Create request data
         data = {
             "prompt": text_prompt,
@@ -915,10 +2647,9 @@ def generate_video_from_text(text_prompt, duration=15, style="casual"):
             "style": style
         }
         
-        # Make API request
-        response = requests.post(
+        # Make API request on the keepalive session
+        response = DEEPA_SESSION.post(
             "https://api.deepa.ai/videos/generate",
-            headers=headers,
             json=data
         )
         
@@ -930,13 +2661,13 @@ def generate_video_from_text(text_prompt, duration=15, style="casual"):
             if 'job_id' in result:
                 job_id = result['job_id']
                 max_attempts = 60  # Maximum polling attempts
-                poll_interval = 5  # Seconds between polling
-                
+                poll_interval = 0.5  # First poll comes fast, grows to 10s
+
                 for attempt in range(max_attempts):
                     # Get job status
-                    status_response = requests.get(
+                    status_response = DEEPA_SESSION.get(
                         f"https://api.deepa.ai/videos/status/{job_id}",
-                        headers=headers
+                        timeout=(5, 30)
                     )
                     
                     if status_response.status_code == 200:
@@ -945,12 +2676,14 @@ def generate_video_from_text(text_prompt, duration=15, style="casual"):
                         if status.get('status') == 'completed':
                             # Download the video
                             video_url = status.get('video_url')
-                            video_response = requests.get(video_url, stream=True)
+                            video_response = DEEPA_DOWNLOAD_SESSION.get(video_url, stream=True, timeout=(5, 60))
                             
                             if video_response.status_code == 200:
+                                # Push the copy loop into C with 1 MiB reads
+                                # instead of thousands of 8 KB Python iterations
                                 with open(output_path, 'wb') as f:
-                                    for chunk in video_response.iter_content(chunk_size=8192):
-                                        f.write(chunk)
+                                    video_response.raw.decode_content = True
+                                    shutil.copyfileobj(video_response.raw, f, length=1 << 20)
                                 
                                 print(f"Successfully generated video from text: {output_path}")
                                 return {"success": True, "video_path": output_path}
@@ -962,9 +2695,11 @@ def generate_video_from_text(text_prompt, duration=15, style="casual"):
                             print(f"Video generation failed: {status.get('error', 'Unknown error')}")
                             return {"success": False, "error": status.get('error', 'Unknown error')}
                         
-                        # Still in progress, wait and try again
+                        # Still in progress - back off exponentially so
+                        # long jobs poll less often
                         print(f"Video generation in progress... (attempt {attempt + 1}/{max_attempts})")
                         time.sleep(poll_interval)
+                        poll_interval = min(10, poll_interval * 2)
                     else:
                         print(f"Failed to get job status, status code: {status_response.status_code}")
                         return {"success": False, "error": f"Failed to get job status: {status_response.text}"}
@@ -974,12 +2709,13 @@ def generate_video_from_text(text_prompt, duration=15, style="casual"):
             # If the API directly returns the video URL
             elif 'video_url' in result:
                 video_url = result['video_url']
-                video_response = requests.get(video_url, stream=True)
+                video_response = DEEPA_DOWNLOAD_SESSION.get(video_url, stream=True, timeout=(5, 60))
                 
                 if video_response.status_code == 200:
+                    # Same C-level copy with 1 MiB reads as the polled branch
                     with open(output_path, 'wb') as f:
-                        for chunk in video_response.iter_content(chunk_size=8192):
-                            f.write(chunk)
+                        video_response.raw.decode_content = True
+                        shutil.copyfileobj(video_response.raw, f, length=1 << 20)
                     
                     print(f"Successfully generated video from text: {output_path}")
                     return {"success": True, "video_path": output_path}
@@ -1010,15 +2746,27 @@ def upload_photo():
         return jsonify({"error": "No selected file"}), 400
     
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
-        # Process the image
-        img = cv2.imread(filepath)
-        if img is None:
+        # Store under the content hash - re-uploads dedupe to a stat call
+        filename, filepath, _ = save_upload_deduped(file, app.config['UPLOAD_FOLDER'])
+
+        # Validate by sniffing the header only - a full cv2.imread decode
+        # of a large photo just to check validity costs ~100ms
+        if PILImage is not None:
+            try:
+                with PILImage.open(filepath) as img:
+                    width, height = img.size
+                    img.verify()
+            except Exception:
+                os.remove(filepath)
+                return jsonify({"error": "Invalid image file"}), 400
+            if width * height > MAX_UPLOAD_MP * 1_000_000:
+                os.remove(filepath)
+                return jsonify({"error": f"Image exceeds {MAX_UPLOAD_MP} megapixels"}), 413
+        elif not _sniff_image_magic(filepath):
+            os.remove(filepath)
             return jsonify({"error": "Invalid image file"}), 400
-        
+
+
         return jsonify({
             "message": "Photo uploaded successfully",
             "filepath": filepath,
@@ -1046,16 +2794,24 @@ def generate_video():
     model_id = data.get('model_id')  # Optional model ID for personalized generation
     
     # Find the voice file if a voice ID is provided
-    voice_file = None
-    if voice_id:
-        for file in os.listdir('voices'):
-            if file.startswith(f"voice_{voice_id}"):
-                voice_file = os.path.join('voices', file)
-                break
+    voice_file = find_voice_file(voice_id) if voice_id else None
     
-    # Generate a unique job ID
+    # Queue the job on Celery when a broker is available so the request
+    # returns immediately and workers can scale independently
+    if celery is not None:
+        try:
+            async_result = process_video_generation_task.delay(image_path, data, voice_file, model_id)
+            return jsonify({
+                "success": True,
+                "job_id": async_result.id,
+                "status": "pending"
+            }), 200
+        except Exception as e:
+            print(f"Could not queue Celery task, falling back to local thread: {e}")
+
+    # Fall back to an in-process background thread
     job_id = str(uuid.uuid4())
-    
+
     # Initialize job status
     job_status[job_id] = JobStatus(
         status="pending",
@@ -1063,13 +2819,9 @@ def generate_video():
         result=None,
         error=None
     )
-    
-    # Start the video generation process in a background thread
-    threading.Thread(
-        target=process_video_generation, 
-        args=(job_id, image_path, data, voice_file, model_id)
-    ).start()
-    
+
+    VIDEO_POOL.submit(process_video_generation, job_id, image_path, data, voice_file, model_id)
+
     return jsonify({
         "success": True,
         "job_id": job_id,
@@ -1079,72 +2831,130 @@ def generate_video():
 @app.route('/api/status/<job_id>', methods=['GET'])
 def check_job_status(job_id):
     """Check the status of a job"""
-    # Check in job_status dictionary first
-    if job_id in job_status:
-        return jsonify({
-            "status": job_status[job_id]["status"],
-            "progress": job_status[job_id]["progress"],
-            "estimated_time_remaining": job_status[job_id].get("estimated_time_remaining"),
-            "result": job_status[job_id].get("result"),
-            "error": job_status[job_id].get("error")
-        })
-    
-    # If not found, check in video_jobs dictionary
-    if job_id in video_jobs:
-        return jsonify({
-            "status": video_jobs[job_id]["status"],
-            "progress": video_jobs[job_id]["progress"],
-            "estimated_time_remaining": video_jobs[job_id].get("estimated_time_remaining"),
-            "result": video_jobs[job_id].get("result"),
-            "error": video_jobs[job_id].get("error")
-        })
+    # One store lookup instead of an `in` test plus five derefs
+    job = job_status.get(job_id) or video_jobs.get(job_id)
+    if job is not None:
+        payload = {
+            "status": job["status"],
+            "progress": job["progress"],
+            "estimated_time_remaining": job.get("estimated_time_remaining"),
+            "result": job.get("result"),
+            "error": job.get("error")
+        }
+        # Pollers hammer this endpoint between progress changes; an ETag
+        # over the payload turns the unchanged polls into 304s
+        response = jsonify(payload)
+        response.set_etag(hashlib.sha1(repr(sorted(payload.items())).encode()).hexdigest()[:16])
+        return response.make_conditional(request)
     
+    # If not found locally, check the Celery result backend
+    if celery is not None:
+        task = celery.AsyncResult(job_id)
+        info = task.info if isinstance(task.info, dict) else {}
+        if task.state == 'PROGRESS':
+            return jsonify({
+                "status": "processing",
+                "progress": info.get("progress", 0),
+                "estimated_time_remaining": info.get("eta"),
+                "result": None,
+                "error": None
+            })
+        if task.state == 'SUCCESS' and info:
+            return jsonify({
+                "status": info.get("status", "completed"),
+                "progress": info.get("progress", 100),
+                "estimated_time_remaining": info.get("estimated_time_remaining", 0),
+                "result": info.get("result"),
+                "error": info.get("error")
+            })
+        if task.state == 'FAILURE':
+            return jsonify({
+                "status": "failed",
+                "progress": 0,
+                "estimated_time_remaining": None,
+                "result": None,
+                "error": str(task.result)
+            })
+        if task.state in ('PENDING', 'STARTED', 'RETRY'):
+            # Queued or just picked up - the worker has not written a job
+            # record yet. This is still a live job the API handed out, not
+            # a 404.
+            return jsonify({
+                "status": "pending" if task.state == 'PENDING' else "processing",
+                "progress": 0,
+                "estimated_time_remaining": None,
+                "result": None,
+                "error": None
+            })
+
     # If not found in either dictionary, return a 404 error
     return jsonify({
         "status": "not_found",
         "error": "Job not found"
     }), 404
 
+def _static_json_response(payload):
+    """Serialize a static payload once and return a prebuilt JSON body"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+# These catalogs never change at runtime, so serialize them at import and
+# serve the same bytes on every request
+_TEMPLATES_JSON = _static_json_response({
+    "templates": [
+        {"id": key, "name": key.replace("_", " ").title(), "description": value}
+        for key, value in {
+            "social_story": "Vertical format optimized for social media stories",
+            "product_showcase": "Highlighting and showcasing a product with animated effects",
+            "dynamic_ad": "Fast-paced ad style with dynamic transitions",
+            "cinematic": "Cinematic style with dramatic effects and transitions"
+        }.items()
+    ]
+})
+
+_INDEX_JSON = _static_json_response({
+    "status": "API is running",
+    "endpoints": [
+        {"method": "POST", "url": "/api/upload-photo", "description": "Upload a photo"},
+        {"method": "POST", "url": "/api/generate-video", "description": "Generate a video"},
+        {"method": "GET", "url": "/api/status/<job_id>", "description": "Check job status"},
+        {"method": "POST", "url": "/api/generate-video-from-text", "description": "Generate video from text prompt"},
+        {"method": "POST", "url": "/api/generate-ad", "description": "Generate professional advertisement"},
+        {"method": "POST", "url": "/api/generate-advanced-video", "description": "Generate advanced motion video with AI"}
+    ]
+})
+
+_EFFECTS_JSON = _static_json_response({
+    "effects": [
+        {"id": key, "name": key.replace("_", " ").title(), "description": value}
+        for key, value in {
+            "resize": "Zoom effect that enlarges the image",
+            "fade_in": "Fade in from black",
+            "fade_out": "Fade out to black",
+            "mirror_x": "Mirror the image horizontally",
+            "mirror_y": "Mirror the image vertically",
+            "colorx": "Enhance colors to make them more vibrant",
+            "painting": "Apply a painting-like effect with enhanced colors",
+            "speedx_slow": "Slow motion effect",
+            "speedx_fast": "Fast motion effect",
+            "time_symmetrize": "Play forwards then backwards",
+            "invert_colors": "Invert all colors in the image"
+        }.items()
+    ]
+})
+
 @app.route('/api/templates', methods=['GET'])
 def get_templates():
     """Get available video templates"""
-    templates = {
-        "social_story": "Vertical format optimized for social media stories",
-        "product_showcase": "Highlighting and showcasing a product with animated effects",
-        "dynamic_ad": "Fast-paced ad style with dynamic transitions",
-        "cinematic": "Cinematic style with dramatic effects and transitions"
-    }
-    
-    return jsonify({
-        "templates": [
-            {"id": key, "name": key.replace("_", " ").title(), "description": value}
-            for key, value in templates.items()
-        ]
-    })
+    return Response(_TEMPLATES_JSON, mimetype='application/json',
+                    headers={'Cache-Control': 'public, max-age=3600'})
 
 @app.route('/api/effects', methods=['GET'])
 def get_effects():
     """Get available video effects"""
-    effects = {
-        "resize": "Zoom effect that enlarges the image",
-        "fade_in": "Fade in from black",
-        "fade_out": "Fade out to black",
-        "mirror_x": "Mirror the image horizontally",
-        "mirror_y": "Mirror the image vertically",
-        "colorx": "Enhance colors to make them more vibrant",
-        "painting": "Apply a painting-like effect with enhanced colors",
-        "speedx_slow": "Slow motion effect",
-        "speedx_fast": "Fast motion effect",
-        "time_symmetrize": "Play forwards then backwards",
-        "invert_colors": "Invert all colors in the image"
-    }
-    
-    return jsonify({
-        "effects": [
-            {"id": key, "name": key.replace("_", " ").title(), "description": value}
-            for key, value in effects.items()
-        ]
-    })
+    return Response(_EFFECTS_JSON, mimetype='application/json',
+                    headers={'Cache-Control': 'public, max-age=3600'})
 
 @app.route('/api/download/<path:filepath>', methods=['GET'])
 def download_file(filepath):
@@ -1170,8 +2980,23 @@ def download_file(filepath):
         # Get the directory and filename
         directory = os.path.dirname(full_path)
         filename = os.path.basename(full_path)
-        
-        return send_from_directory(directory, filename, as_attachment=True)
+
+        # Behind nginx, hand off the byte path entirely: the worker
+        # answers with headers only and nginx streams the file with
+        # sendfile(2) from the matching internal location
+        if X_ACCEL_REDIRECT_PREFIX:
+            rel = os.path.relpath(full_path, app.config['OUTPUT_FOLDER'])
+            response = Response(
+                mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            )
+            response.headers['X-Accel-Redirect'] = f"{X_ACCEL_REDIRECT_PREFIX}/{rel}"
+            response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+            return response
+
+        # conditional=True gives ETag/Range support, so clients can resume
+        # and seek without a full re-download
+        return send_from_directory(directory, filename, as_attachment=True,
+                                   conditional=True, max_age=3600)
     except Exception as e:
         print(f"Error during download: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -1191,10 +3016,8 @@ def upload_voice():
         # Save the file
         voice_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'voices')
         os.makedirs(voice_dir, exist_ok=True)
-        
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(voice_dir, filename)
-        file.save(filepath)
+
+        filename, filepath, _ = save_upload_deduped(file, voice_dir)
         
         return jsonify({
             "success": True,
@@ -1253,7 +3076,8 @@ def clone_voice():
             
         # Get the voice ID from the response
         voice_id = create_response.json().get("voice_id")
-        
+        invalidate_elevenlabs_voices()
+
         if not voice_id:
             return jsonify({
                 "success": False,
@@ -1290,15 +3114,8 @@ def clone_voice():
         
         # Save this info to a file for persistence
         cloned_voices_file = os.path.join(app.config['UPLOAD_FOLDER'], 'cloned_voices.json')
-        cloned_voices = []
-        
-        if os.path.exists(cloned_voices_file):
-            try:
-                with open(cloned_voices_file, 'r') as f:
-                    cloned_voices = json.load(f)
-            except:
-                cloned_voices = []
-                
+        # Copy so the cached listing is never mutated in place
+        cloned_voices = list(load_cloned_voices(cloned_voices_file))
         cloned_voices.append(custom_voice)
         
         with open(cloned_voices_file, 'w') as f:
@@ -1317,7 +3134,7 @@ def clone_voice():
 
 @app.route('/api/voices/<filename>', methods=['GET'])
 def get_voice(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    return send_immutable_file(app.config['UPLOAD_FOLDER'], filename)
 
 @app.route('/api/voices/available', methods=['GET'])
 def get_available_voices():
@@ -1412,7 +3229,7 @@ def get_available_voices():
         custom_voices = []
         voice_folder = os.path.join(app.config['UPLOAD_FOLDER'], 'voices')
         if os.path.exists(voice_folder):
-            for file in os.listdir(voice_folder):
+            for file in _list_dir_cached(voice_folder):
                 if file.endswith(('.mp3', '.wav')):
                     voice_id = 'custom-' + os.path.splitext(file)[0]
                     name = os.path.splitext(file)[0].replace('_', ' ').title()
@@ -1425,35 +3242,19 @@ def get_available_voices():
                         "description": "Your custom uploaded voice."
                     })
         
-        # Get cloned voices from the JSON file
-        cloned_voices = []
+        # Get cloned voices from the mtime-cached JSON listing
         cloned_voices_file = os.path.join(app.config['UPLOAD_FOLDER'], 'cloned_voices.json')
-        if os.path.exists(cloned_voices_file):
-            try:
-                with open(cloned_voices_file, 'r') as f:
-                    cloned_voices = json.load(f)
-            except Exception as e:
-                print(f"Error loading cloned voices: {str(e)}")
+        cloned_voices = load_cloned_voices(cloned_voices_file)
         
-        # Fetch additional voices from ElevenLabs API if available
+        # Fetch additional voices from the cached ElevenLabs listing
         if ELEVEN_LABS_API_KEY:
             try:
-                headers = {
-                    "xi-api-key": ELEVEN_LABS_API_KEY,
-                    "Accept": "application/json"
-                }
-                
-                response = elevenlabs_requests.get(
-                    "https://api.elevenlabs.io/v1/voices",
-                    headers=headers
-                )
-                
-                if response.status_code == 200:
-                    api_voices = response.json().get("voices", [])
-                    
+                api_voices = get_elevenlabs_voices()
+
+                if api_voices:
                     # Filter out voices that are already in our list
                     existing_voice_ids = [v["voice_id"] for v in elevenlabs_voices]
-                    
+
                     for voice in api_voices:
                         if voice["voice_id"] not in existing_voice_ids:
                             # Determine category based on labels or default to "other"
@@ -1528,15 +3329,10 @@ def upload_training_files():
         if file_type not in ['image', 'video']:
             file_type = 'image' if file.content_type.startswith('image/') else 'video'
         
-        # Generate a unique filename
-        file_id = str(uuid.uuid4())
-        ext = file.filename.rsplit('.', 1)[1].lower() if '.' in file.filename else 'jpg'
-        filename = f"{file_type}_{file_id}.{ext}"
-        filepath = os.path.join(model_dir, filename)
-        
-        # Save the file
-        file.save(filepath)
-        
+        # Save under the content hash - duplicate files within a model
+        # collapse to a single copy on disk
+        filename, filepath, file_id = save_upload_deduped(file, model_dir, prefix=f"{file_type}_")
+
         # Add to training files
         training_files.append(TrainingFile(
             id=file_id,
@@ -1561,12 +3357,97 @@ def upload_training_files():
         "model": training_models[model_id].dict()
     }), 200
 
+@app.route('/api/upload-training/stream', methods=['POST'])
+def upload_training_file_stream():
+    """
+    Stream one raw training file straight to disk.
+
+    Companion to /api/upload-training for large videos: the client sends
+    the bare file bytes as the request body (no multipart), so nothing is
+    buffered or spooled by the form parser - the body is copied from
+    request.stream into the model directory in 4 MiB chunks at disk speed.
+
+    Query params:
+        model_id: Existing model to append to; a new model is created
+            when omitted
+
+    Headers:
+        X-File-Name: Original filename (used for the extension)
+        X-File-Type: 'image' or 'video' (falls back to Content-Type)
+    """
+    model_id = request.args.get('model_id')
+    model = None
+    if model_id:
+        model = training_models.get(model_id)
+        if model is None:
+            return jsonify({"success": False, "error": "Unknown model ID"}), 404
+    else:
+        model_id = str(uuid.uuid4())
+
+    model_dir = os.path.join('training', model_id)
+    os.makedirs(model_dir, exist_ok=True)
+
+    file_type = request.headers.get('X-File-Type')
+    if file_type not in ['image', 'video']:
+        content_type = request.headers.get('Content-Type', '')
+        file_type = 'image' if content_type.startswith('image/') else 'video'
+
+    # Hash while writing, then rename to the content hash - the same
+    # dedupe scheme as save_upload_deduped, reading the raw body directly
+    ext = os.path.splitext(secure_filename(request.headers.get('X-File-Name', '')))[1].lower()
+    hasher = blake3.blake3() if blake3 is not None else hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=model_dir)
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            for chunk in iter(lambda: request.stream.read(4 << 20), b''):
+                hasher.update(chunk)
+                tmp.write(chunk)
+        content_hash = hasher.hexdigest()[:16]
+        filename = f"{file_type}_{content_hash}{ext}"
+        filepath = os.path.join(model_dir, filename)
+        if os.path.exists(filepath):
+            # Same bytes already on disk - drop the duplicate
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, filepath)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        print(f"Error streaming training upload: {str(e)}")
+        return jsonify({"success": False, "error": f"Failed to save file: {str(e)}"}), 500
+
+    training_file = TrainingFile(
+        id=content_hash,
+        filename=filename,
+        type=file_type,
+        url=f"/api/training/{model_id}/{filename}"
+    )
+
+    if model is None:
+        training_models[model_id] = TrainingModel(
+            id=model_id,
+            name=f"Model {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            created_at=datetime.now().isoformat(),
+            status="uploaded",
+            training_files=[training_file]
+        )
+    else:
+        # Reassign rather than append in place so the update writes
+        # through to Redis
+        model.training_files = model.training_files + [training_file]
+
+    return jsonify({
+        "success": True,
+        "model_id": model_id,
+        "file": training_file.dict()
+    }), 200
+
 @app.route('/api/training/<model_id>/<filename>', methods=['GET'])
 def get_training_file(model_id, filename):
     """
     Get a training file by model ID and filename
     """
-    return send_from_directory(os.path.join('training', model_id), filename)
+    return send_immutable_file(os.path.join('training', model_id), filename)
 
 @app.route('/api/training/start', methods=['POST'])
 def start_training():
@@ -1587,11 +3468,8 @@ def start_training():
     training_models[model_id].status = "training"
     
     # In a real implementation, this would trigger a training job
-    # For demonstration, we'll simulate training with a background thread
-    threading.Thread(
-        target=simulate_training,
-        args=(model_id,)
-    ).start()
+    # For demonstration, we'll simulate training on the shared scheduler
+    simulate_training(model_id)
     
     return jsonify({
         "success": True,
@@ -1615,6 +3493,21 @@ def get_training_status(model_id):
 @app.route('/api/models', methods=['GET'])
 def get_models():
     """Get all trained models"""
+    # The completed-model set answers the listing directly, instead of
+    # scanning every model record and filtering in Python
+    if _redis_client is not None:
+        try:
+            models = []
+            for model_id in _redis_client.smembers('models:completed'):
+                model = training_models.get(model_id)
+                if model is not None:
+                    models.append(model.dict())
+                else:
+                    # Record expired - drop the stale index entry
+                    _redis_client.srem('models:completed', model_id)
+            return jsonify({"success": True, "models": models}), 200
+        except Exception as e:
+            print(f"Could not read completed-model index: {e}")
     return jsonify({
         "success": True,
         "models": [model.dict() for model in training_models.values() if model.status == "completed"]
@@ -1640,11 +3533,23 @@ def text_to_video():
     
     if voice_id:
         # Find the voice file based on ID
-        voice_files = [f for f in os.listdir('voices') if voice_id in f]
-        if voice_files:
-            voice_file = os.path.join('voices', voice_files[0])
+        voice_file = find_voice_file(voice_id)
+        if voice_file:
             print(f"Using voice file: {voice_file}")
-    
+
+    # Queue on Celery when a broker is available so the DEEPA polling
+    # happens on the io-queue workers instead of in this process
+    if celery is not None:
+        try:
+            async_result = process_text_to_video_task.delay(text_prompt, duration, style, voice_file)
+            return jsonify({
+                "success": True,
+                "job_id": async_result.id,
+                "status": "processing"
+            }), 200
+        except Exception as e:
+            print(f"Could not queue Celery task, falling back to local pool: {e}")
+
     # Generate a unique job ID
     job_id = str(uuid.uuid4())
     
@@ -1657,13 +3562,9 @@ def text_to_video():
         started_at=time.time()
     )
     
-    # Start processing in background thread
-    process_thread = threading.Thread(
-        target=process_text_to_video_generation,
-        args=(job_id, text_prompt, duration, style, voice_file)
-    )
-    process_thread.daemon = True
-    process_thread.start()
+    # Text-to-video jobs are network-bound, so they get their own pool
+    # and never hold an encode worker
+    DEEPA_POLL_POOL.submit(process_text_to_video_generation, job_id, text_prompt, duration, style, voice_file)
     
     return jsonify({
         "success": True,
@@ -1698,10 +3599,7 @@ def process_text_to_video_generation(job_id, text_prompt, duration, style, voice
         # Add voiceover if requested
         if voice_file:
             try:
-                # Generate TTS audio
-                audio_path = generate_tts_audio(script, voice_file=voice_file)
-                
-                # Add voiceover to video
+                # add_voiceover_to_video synthesizes its own TTS track
                 voiceover_result = add_voiceover_to_video(video_path, script, voice_file=voice_file)
                 
                 # Use video with voiceover if successful
@@ -1731,30 +3629,72 @@ def process_text_to_video_generation(job_id, text_prompt, duration, style, voice
         job_status[job_id].status = "failed"
         job_status[job_id].error = f"Failed to generate video: {str(e)}"
 
-def simulate_training(model_id):
-    """Simulate training a model (for demo purposes)"""
+if celery is not None:
+    @celery.task(bind=True, name='videogen.process_text_to_video')
+    def process_text_to_video_task(self, text_prompt, duration, style, voice_file=None):
+        """Celery entry point for text-to-video; the task ID doubles as the job ID"""
+        job_id = self.request.id
+        if job_id not in job_status:
+            job_status[job_id] = JobStatus(
+                status="processing",
+                progress=0,
+                estimated_time_remaining=calculate_estimated_time(duration, voice_file is not None),
+                started_at=time.time()
+            )
+        process_text_to_video_generation(job_id, text_prompt, duration, style, voice_file)
+        final_status = job_status.get(job_id)
+        return dict(final_status) if final_status else None
+
+# One daemon thread drives every in-flight training simulation off a
+# shared scheduler, instead of parking a sleeping thread per model
+TRAINING_SCHEDULER = sched.scheduler(time.monotonic, time.sleep)
+_training_scheduler_lock = threading.Lock()
+_training_scheduler_started = False
+
+def _run_training_scheduler():
+    while True:
+        TRAINING_SCHEDULER.run()
+        time.sleep(0.5)
+
+def _ensure_training_scheduler():
+    """Start the scheduler thread the first time a training is queued"""
+    global _training_scheduler_started
+    with _training_scheduler_lock:
+        if not _training_scheduler_started:
+            threading.Thread(target=_run_training_scheduler, daemon=True).start()
+            _training_scheduler_started = True
+
+_TRAINING_STEPS = ["preprocessing", "feature_extraction", "training", "finetuning", "completed"]
+
+def _advance_training(model_id, step_index):
+    """Move a simulated training to its next step and reschedule"""
     try:
-        # Simulated training steps
-        steps = ["preprocessing", "feature_extraction", "training", "finetuning", "completed"]
-        
-        for step in steps:
-            # Update status
-            training_models[model_id].status = step
-            
-            # Simulate processing time
-            time.sleep(2)
-        
-        # Create a dummy model file
-        model_file = os.path.join('models', f"{model_id}.model")
-        with open(model_file, 'w') as f:
-            f.write(f"Simulated model created at {datetime.now().isoformat()}")
-        
-        print(f"Model {model_id} training completed")
-    
+        step = _TRAINING_STEPS[step_index]
+        training_models[model_id].status = step
+
+        if step == "completed":
+            # Create a dummy model file
+            model_file = os.path.join('models', f"{model_id}.model")
+            with open(model_file, 'w') as f:
+                f.write(f"Simulated model created at {datetime.now().isoformat()}")
+            if _redis_client is not None:
+                try:
+                    _redis_client.sadd('models:completed', model_id)
+                except Exception as index_err:
+                    print(f"Could not index completed model: {index_err}")
+            print(f"Model {model_id} training completed")
+        else:
+            TRAINING_SCHEDULER.enter(2, 1, _advance_training, (model_id, step_index + 1))
+
     except Exception as e:
         print(f"Error in training simulation: {str(e)}")
         training_models[model_id].status = "failed"
 
+def simulate_training(model_id):
+    """Simulate training a model (for demo purposes)"""
+    _ensure_training_scheduler()
+    TRAINING_SCHEDULER.enter(0, 1, _advance_training, (model_id, 0))
+
 def calculate_estimated_time(duration, add_voiceover=False):
     """Calculate the estimated time for video generation in seconds"""
     # Base time depends on video duration (typically takes longer for longer videos)
@@ -1825,12 +3765,23 @@ def create_ad():
     colors = COLOR_SCHEMES.get(color_scheme, COLOR_SCHEMES['blue'])
     
     # Prepare voice file if provided
-    voice_file = None
-    if voice_id:
-        voice_files = [f for f in os.listdir('voices') if voice_id in f]
-        if voice_files:
-            voice_file = os.path.join('voices', voice_files[0])
-    
+    voice_file = find_voice_file(voice_id) if voice_id else None
+
+    # Queue on Celery when a broker is available so ad renders land on the
+    # encode-queue workers instead of this process
+    if celery is not None:
+        try:
+            async_result = process_ad_generation_task.delay(prompt, brand_name, tagline, target_audience,
+                                                            duration, style, template, color_scheme,
+                                                            animation_style, voice_file)
+            return jsonify({
+                "success": True,
+                "job_id": async_result.id,
+                "status": "processing"
+            }), 200
+        except Exception as e:
+            print(f"Could not queue Celery task, falling back to local pool: {e}")
+
     # Generate a unique job ID
     job_id = str(uuid.uuid4())
     
@@ -1843,13 +3794,8 @@ def create_ad():
         started_at=time.time()
     )
     
-    # Start processing in background thread
-    process_thread = threading.Thread(
-        target=process_ad_generation,
-        args=(job_id, prompt, brand_name, tagline, target_audience, duration, style, template, color_scheme, animation_style, voice_file)
-    )
-    process_thread.daemon = True
-    process_thread.start()
+    # Start processing on the shared worker pool
+    VIDEO_POOL.submit(process_ad_generation, job_id, prompt, brand_name, tagline, target_audience, duration, style, template, color_scheme, animation_style, voice_file)
     
     return jsonify({
         "success": True,
@@ -1888,7 +3834,191 @@ def parse_timing(timing_str):
         # Default to 3 seconds if we can't parse
         return 3.0
 
-def process_ad_generation(job_id, prompt, brand_name, tagline, target_audience, 
+def create_ad_video_ffmpeg_direct(scenes, ad_script, audio_path, output_path):
+    """
+    Render the whole ad (scene animations, concat, text overlays, audio
+    mux) in one native ffmpeg filter_complex pass, skipping MoviePy's
+    per-frame Python callbacks.
+
+    Zoom maps to zoompan, fades to fade, and slide-in to an overlay that
+    pans the frame in over black. Text overlays are rasterized once with
+    PIL and composited with per-scene enable windows; stroke and custom
+    fonts from the script are approximated by the shared caption style.
+
+    Returns:
+        True on success, or None so the caller can fall back to MoviePy
+    """
+    caption_paths = []
+    try:
+        first = cv2.imread(scenes[0]["path"])
+        if first is None:
+            return None
+        frame_w, frame_h = first.shape[1], first.shape[0]
+
+        cmd = []
+        for scene in scenes:
+            cmd += ['-loop', '1', '-t', f"{scene['duration']:.3f}", '-i', scene["path"]]
+
+        filters = []
+        scene_labels = []
+        for i, scene in enumerate(scenes):
+            dur = scene["duration"]
+            animation_desc = scene["animation"].lower()
+            chain = f"scale={frame_w}:{frame_h},fps=24,format=yuv420p,setpts=PTS-STARTPTS"
+            if "zoom" in animation_desc:
+                # Matches the MoviePy 1 + 0.05t resize at 24 fps
+                chain += f",zoompan=z='min(zoom+0.00208,1.5)':d=1:x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)':s={frame_w}x{frame_h}:fps=24"
+            if "fade in" in animation_desc:
+                chain += ",fade=t=in:st=0:d=0.5"
+            if "fade out" in animation_desc:
+                chain += f",fade=t=out:st={max(dur - 0.5, 0):.3f}:d=0.5"
+            if "slide" in animation_desc:
+                filters.append(f"[{i}:v]{chain}[fg{i}]")
+                filters.append(f"color=black:s={frame_w}x{frame_h}:r=24:d={dur:.3f}[bg{i}]")
+                filters.append(f"[bg{i}][fg{i}]overlay=x='min(0,-W+(W/0.5)*t)':y=0[s{i}]")
+            else:
+                filters.append(f"[{i}:v]{chain}[s{i}]")
+            scene_labels.append(f"[s{i}]")
+
+        filters.append(f"{''.join(scene_labels)}concat=n={len(scenes)}:v=1:a=0[v]")
+        current = "[v]"
+
+        # Scene start times for the overlay enable windows
+        scene_starts = []
+        t = 0.0
+        for scene in scenes:
+            scene_starts.append(t)
+            t += scene["duration"]
+
+        overlays = ad_script.get("text_overlays", []) if PILImage is not None else []
+        for j, text_overlay in enumerate(overlays):
+            scene_idx = text_overlay.get("scene", 0) - 1
+            if not 0 <= scene_idx < len(scenes):
+                continue
+            arr = _render_caption(
+                text_overlay.get("text", ""),
+                text_overlay.get("size", 40),
+                int(frame_w * 0.8),
+                text_overlay.get("color", "white"),
+                (0, 0, 0, 0)
+            )
+            if arr is None:
+                continue
+            fd, caption_path = tempfile.mkstemp(suffix='.png')
+            os.close(fd)
+            PILImage.fromarray(arr).save(caption_path)
+            caption_paths.append(caption_path)
+            cmd += ['-i', caption_path]
+            position = text_overlay.get("position", "center")
+            if position == "top":
+                y_expr = "50"
+            elif position == "bottom":
+                y_expr = "H-h-50"
+            else:
+                y_expr = "(H-h)/2"
+            start = scene_starts[scene_idx]
+            end = start + scenes[scene_idx]["duration"]
+            idx = len(scenes) + len(caption_paths) - 1
+            filters.append(
+                f"{current}[{idx}:v]overlay=(W-w)/2:{y_expr}:"
+                f"enable='between(t,{start:.3f},{end:.3f})'[t{j}]"
+            )
+            current = f"[t{j}]"
+
+        if caption_paths:
+            # Re-pin the pixel format after the RGBA caption composites
+            filters.append(f"{current}format=yuv420p[vout]")
+            current = "[vout]"
+
+        audio_index = None
+        if audio_path:
+            audio_index = len(scenes) + len(caption_paths)
+            cmd += ['-i', audio_path]
+        cmd += ['-filter_complex', ';'.join(filters), '-map', current]
+        if audio_index is not None:
+            cmd += ['-map', f"{audio_index}:a", '-c:a', 'aac', '-shortest']
+        cmd += ['-r', '24', '-c:v', HW_VIDEO_CODEC, '-b:v', '4000k'] + direct_encode_args() + [output_path]
+
+        result = run_ffmpeg(cmd, capture_output=True, text=True)
+        if result.returncode != 0 or not os.path.exists(output_path):
+            print(f"Direct ad render failed: {result.stderr[-500:]}")
+            return None
+        return True
+    except Exception as e:
+        print(f"Error in create_ad_video_ffmpeg_direct: {str(e)}")
+        return None
+    finally:
+        for caption_path in caption_paths:
+            if os.path.exists(caption_path):
+                os.remove(caption_path)
+
+@functools.lru_cache(maxsize=64)
+def _make_text_clip(text, fontsize, color, font, stroke_color, stroke_width):
+    """
+    Build a TextClip, memoized by its render parameters. TextClip spawns
+    an ImageMagick process per call, so repeated brand text across scenes
+    rasterizes once. Callers set position/duration on the returned clip,
+    which copy rather than mutate, so sharing the base clip is safe.
+    """
+    return TextClip(
+        text,
+        fontsize=fontsize,
+        color=color,
+        font=font,
+        stroke_color=stroke_color,
+        stroke_width=stroke_width
+    )
+
+def _extract_complete_scenes(buffer):
+    """
+    Best-effort incremental parse of a streamed storyboard: return the
+    complete scene objects seen so far inside the "scenes" array, so
+    DALL-E calls can start before the model finishes the full response.
+
+    Args:
+        buffer: The partial JSON response accumulated from the stream
+
+    Returns:
+        list: Parsed scene dicts, in order
+    """
+    start = buffer.find('"scenes"')
+    if start != -1:
+        start = buffer.find('[', start)
+    if start == -1:
+        return []
+    scenes = []
+    depth = 0
+    obj_start = None
+    in_str = False
+    escaped = False
+    for i in range(start + 1, len(buffer)):
+        ch = buffer[i]
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == '{':
+            if depth == 0:
+                obj_start = i
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0 and obj_start is not None:
+                try:
+                    scenes.append(json_loads_fast(buffer[obj_start:i + 1]))
+                except Exception:
+                    pass
+                obj_start = None
+        elif ch == ']' and depth == 0:
+            break
+    return scenes
+
+def process_ad_generation(job_id, prompt, brand_name, tagline, target_audience,
                          duration, style, template, color_scheme, animation_style, voice_file=None):
     """Process ad generation in the background"""
     try:
@@ -1920,82 +4050,118 @@ Format as a JSON object with these fields:
 - music_suggestion: Type of background music that fits
 """
 
-        response = openai.chat.completions.create(
-            model="gpt-4-turbo",
-            temperature=0.7,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": prompt}
-            ]
-        )
-        
-        # Extract the JSON content from the response
-        script_content = response.choices[0].message.content
-        
-        # Clean up the response to extract just the JSON part
-        if "```json" in script_content:
-            script_content = script_content.split("```json")[1].split("```")[0].strip()
-        elif "```" in script_content:
-            script_content = script_content.split("```")[1].split("```")[0].strip()
-            
-        ad_script = json.loads(script_content)
-        
-        # Update job status to 30%
-        job_status[job_id].progress = 30
-        job_status[job_id].estimated_time_remaining = update_estimated_time(job_status[job_id], 30)
-        
-        # 2. Generate animation scenes using visual prompts
-        scenes = []
-        for i, scene in enumerate(ad_script["scenes"]):
-            # Generate scene visuals using DALL-E
+        # The storyboard is a pure function of the ad parameters, so serve
+        # repeat requests from the shared OpenAI cache
+        ad_cache_key = ('ad_script', prompt, brand_name, tagline, target_audience,
+                        duration, style, template, color_scheme, animation_style)
+
+        # Scene helpers are set up before the OpenAI call so DALL-E
+        # requests can be dispatched while the storyboard is still
+        # streaming in
+        scene_folder = os.path.join('temp', job_id)
+        os.makedirs(scene_folder, exist_ok=True)
+
+        def generate_scene(i, scene):
             scene_prompt = f"""Create a professional {style} advertisement visual for {brand_name}.
 Scene description: {scene['description']}
 Animation style: {ANIMATION_STYLES.get(animation_style, ANIMATION_STYLES['sleek'])}
 Color scheme: Primary {COLOR_SCHEMES[color_scheme]['primary']}, Secondary {COLOR_SCHEMES[color_scheme]['secondary']}
 Make it high quality, professional, and NOT AI-generated looking. Create a clean, professional ad frame.
 """
-            
-            # Use DALL-E to generate scene image
-            try:
-                dalle_response = openai.images.generate(
-                    model="dall-e-3",
-                    prompt=scene_prompt,
-                    size="1024x1024",
-                    quality="standard",
-                    n=1
-                )
-                
-                # Save the generated image
-                image_url = dalle_response.data[0].url
-                image_data = requests.get(image_url).content
-                
-                # Create scene folder
-                scene_folder = os.path.join('temp', job_id)
-                os.makedirs(scene_folder, exist_ok=True)
-                
-                # Save image
-                image_path = os.path.join(scene_folder, f"scene_{i+1}.png")
+            dalle_response = openai_client.images.generate(
+                model="dall-e-3",
+                prompt=scene_prompt,
+                size="1024x1024",
+                quality="standard",
+                n=1
+            )
+
+            # Stream the generated image straight to disk
+            image_url = dalle_response.data[0].url
+            image_path = os.path.join(scene_folder, f"scene_{i+1}.png")
+            with DALLE_SESSION.get(image_url, stream=True) as img_response:
                 with open(image_path, 'wb') as img_file:
-                    img_file.write(image_data)
-                    
-                # Add to scenes list
-                scenes.append({
-                    "path": image_path,
-                    "duration": parse_timing(scene["timing"]),
-                    "voiceover": scene["voiceover"],
-                    "animation": scene["animation"]
-                })
-                
-                # Update progress (scenes are 30% to 70% of progress)
-                progress = 30 + int(40 * (i + 1) / len(ad_script["scenes"]))
-                job_status[job_id].progress = progress
-                job_status[job_id].estimated_time_remaining = update_estimated_time(job_status[job_id], progress)
-                
+                    shutil.copyfileobj(img_response.raw, img_file, length=1 << 20)
+
+            # Shrink the 1024px DALL-E frame once at download time when a
+            # smaller output is configured, so every per-frame filter and
+            # encode stage downstream works on fewer pixels
+            if AD_SCENE_SIDE:
+                downscale_image_inplace(image_path, max_short_side=AD_SCENE_SIDE)
+
+            return {
+                "path": image_path,
+                "duration": parse_timing(scene["timing"]),
+                "voiceover": scene["voiceover"],
+                "animation": scene["animation"]
+            }
+
+        early_futures = {}
+        ad_script = openai_cache_get(ad_cache_key)
+        if ad_script is None:
+            # Stream the completion and submit each scene's DALL-E render
+            # the moment its JSON object is complete, overlapping the tail
+            # of the GPT response with the long-pole image generation.
+            # json_object mode guarantees a bare JSON body, so the old
+            # code-fence cleanup goes away.
+            stream = openai_client.chat.completions.create(
+                model="gpt-4-turbo",
+                temperature=0.7,
+                response_format={"type": "json_object"},
+                stream=True,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            parts = []
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                parts.append(delta)
+                if '}' in delta:
+                    for scene in _extract_complete_scenes(''.join(parts))[len(early_futures):]:
+                        i = len(early_futures)
+                        early_futures[i] = OPENAI_POOL.submit(generate_scene, i, scene)
+
+            ad_script = json_loads_fast(''.join(parts))
+            openai_cache_set(ad_cache_key, ad_script)
+
+        # Update job status to 30%
+        job_status[job_id].progress = 30
+        job_status[job_id].estimated_time_remaining = update_estimated_time(job_status[job_id], 30)
+        
+        # 2. Generate animation scenes using visual prompts. Each scene is
+        # an independent DALL-E call plus a download (10-30s of pure API
+        # latency), so they run concurrently on the OpenAI pool and finish
+        # in roughly the time of the slowest scene instead of the sum.
+        # Scenes already dispatched during streaming are reused as-is.
+        scenes = [None] * len(ad_script["scenes"])
+        scene_futures = {}
+        for i, scene in enumerate(ad_script["scenes"]):
+            future = early_futures.get(i)
+            if future is None:
+                future = OPENAI_POOL.submit(generate_scene, i, scene)
+            scene_futures[future] = i
+        completed_scenes = 0
+        for future in as_completed(scene_futures):
+            i = scene_futures[future]
+            try:
+                scenes[i] = future.result()
             except Exception as e:
                 print(f"Error generating scene {i+1}: {str(e)}")
                 job_status[job_id].status = "failed"
                 job_status[job_id].error = f"Failed to generate scene {i+1}: {str(e)}"
+                for pending in scene_futures:
+                    pending.cancel()
                 return
+
+            # Update progress (scenes are 30% to 70% of progress)
+            completed_scenes += 1
+            progress = 30 + int(40 * completed_scenes / len(scene_futures))
+            job_status[job_id].progress = progress
+            job_status[job_id].estimated_time_remaining = update_estimated_time(job_status[job_id], progress)
         
         # 3. Generate voiceover audio
         audio_path = None
@@ -2015,42 +4181,33 @@ Make it high quality, professional, and NOT AI-generated looking. Create a clean
                         # Extract voice name from file
                         voice_name = os.path.basename(voice_file).split('.')[0]
                         
-                        # Check for existing voice
+                        # Resolve against the cached name -> id map
                         headers = {"xi-api-key": ELEVEN_LABS_API_KEY}
-                        response = elevenlabs_requests.get(
-                            "https://api.elevenlabs.io/v1/voices",
-                            headers=headers
-                        )
-                        
-                        if response.status_code == 200:
-                            voices = response.json().get("voices", [])
-                            # Check if we already have this voice
-                            for v in voices:
-                                if v["name"] == voice_name:
-                                    voice_id = v["voice_id"]
-                                    print(f"Using existing voice ID: {voice_id}")
-                                    break
-                        
-                            # If not found, create a new voice
-                            if voice_id == "EXAVITQu4vr4xnSDxMaL":  # Still using default
-                                print("Creating new voice with Eleven Labs")
-                                with open(voice_file, "rb") as f:
-                                    files = {
-                                        "files": (os.path.basename(voice_file), f, "audio/mpeg"),
-                                    }
-                                    data = {
-                                        "name": voice_name,
-                                        "description": "Uploaded custom voice"
-                                    }
-                                    response = elevenlabs_requests.post(
-                                        "https://api.elevenlabs.io/v1/voices/add",
-                                        headers=headers,
-                                        files=files,
-                                        data=data
-                                    )
-                                    if response.status_code == 200:
-                                        voice_id = response.json().get("voice_id")
-                                        print(f"Created new voice ID: {voice_id}")
+                        existing_id = elevenlabs_voice_id(voice_name)
+                        if existing_id:
+                            voice_id = existing_id
+                            print(f"Using existing voice ID: {voice_id}")
+                        else:
+                            # Not found, create a new voice
+                            print("Creating new voice with Eleven Labs")
+                            with open(voice_file, "rb") as f:
+                                files = {
+                                    "files": (os.path.basename(voice_file), f, "audio/mpeg"),
+                                }
+                                data = {
+                                    "name": voice_name,
+                                    "description": "Uploaded custom voice"
+                                }
+                                response = elevenlabs_requests.post(
+                                    "https://api.elevenlabs.io/v1/voices/add",
+                                    headers=headers,
+                                    files=files,
+                                    data=data
+                                )
+                                if response.status_code == 200:
+                                    voice_id = response.json().get("voice_id")
+                                    print(f"Created new voice ID: {voice_id}")
+                                    invalidate_elevenlabs_voices()
                     except Exception as e:
                         print(f"Error getting/creating voice: {str(e)}")
                         # Continue with default voice
@@ -2074,12 +4231,14 @@ Make it high quality, professional, and NOT AI-generated looking. Create a clean
                 response = elevenlabs_requests.post(
                     f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
                     headers=headers,
-                    json=data
+                    json=data,
+                    stream=True
                 )
-                
+
                 if response.status_code == 200:
+                    # Stream the MP3 to disk instead of buffering it whole
                     with open(temp_audio_path, "wb") as f:
-                        f.write(response.content)
+                        shutil.copyfileobj(response.raw, f, length=1 << 16)
                     audio_path = temp_audio_path
                     print(f"Generated TTS audio using Eleven Labs: {audio_path}")
                 else:
@@ -2110,75 +4269,88 @@ Make it high quality, professional, and NOT AI-generated looking. Create a clean
             os.makedirs(output_folder, exist_ok=True)
             
             output_path = os.path.join(output_folder, f"ad_{job_id}.mp4")
-            
-            # Create video clips for each scene
-            video_clips = []
-            for scene in scenes:
-                # Create image clip
-                img_clip = ImageClip(scene["path"]).set_duration(scene["duration"])
-                
-                # Apply animation effects based on description
-                animation_desc = scene["animation"].lower()
-                
-                if "zoom" in animation_desc:
-                    img_clip = img_clip.fx(vfx.resize, lambda t: 1 + 0.05 * t)
-                
-                if "fade in" in animation_desc:
-                    img_clip = img_clip.fx(vfx.fadein, 0.5)
-                
-                if "fade out" in animation_desc:
-                    img_clip = img_clip.fx(vfx.fadeout, 0.5)
-                
-                if "slide" in animation_desc:
-                    img_clip = img_clip.fx(vfx.slide_in, 0.5, 'left')
-                
-                # Add texts from the ad_script if they match this scene's timing
-                text_clips = []
+
+            # Render natively in one ffmpeg filter_complex pass; MoviePy's
+            # per-frame Python pipeline below stays as the fallback
+            if not create_ad_video_ffmpeg_direct(scenes, ad_script, audio_path, output_path):
+                # Bucket the overlays by scene number once, instead of
+                # rescanning the overlay list (and the scenes list, via
+                # scenes.index) for every scene
+                overlays_by_scene = defaultdict(list)
                 for text_overlay in ad_script.get("text_overlays", []):
-                    if text_overlay.get("scene") == scenes.index(scene) + 1:
-                        txt = TextClip(
-                            text_overlay.get("text", ""), 
-                            fontsize=text_overlay.get("size", 40), 
-                            color=text_overlay.get("color", "white"), 
-                            font=text_overlay.get("font", "Arial-Bold"),
-                            stroke_color=text_overlay.get("stroke_color", "black"),
-                            stroke_width=text_overlay.get("stroke_width", 1)
+                    overlays_by_scene[text_overlay.get("scene")].append(text_overlay)
+
+                # Create video clips for each scene
+                video_clips = []
+                for scene_number, scene in enumerate(scenes, start=1):
+                    # Create image clip
+                    img_clip = ImageClip(scene["path"]).set_duration(scene["duration"])
+
+                    # Apply animation effects based on description
+                    animation_desc = scene["animation"].lower()
+
+                    if "zoom" in animation_desc:
+                        img_clip = img_clip.fx(vfx.resize, lambda t: 1 + 0.05 * t)
+
+                    if "fade in" in animation_desc:
+                        img_clip = img_clip.fx(vfx.fadein, 0.5)
+
+                    if "fade out" in animation_desc:
+                        img_clip = img_clip.fx(vfx.fadeout, 0.5)
+
+                    if "slide" in animation_desc:
+                        img_clip = img_clip.fx(vfx.slide_in, 0.5, 'left')
+
+                    # Add texts from the ad_script if they match this scene's timing
+                    text_clips = []
+                    for text_overlay in overlays_by_scene.get(scene_number, []):
+                        txt = _make_text_clip(
+                            text_overlay.get("text", ""),
+                            text_overlay.get("size", 40),
+                            text_overlay.get("color", "white"),
+                            text_overlay.get("font", "Arial-Bold"),
+                            text_overlay.get("stroke_color", "black"),
+                            text_overlay.get("stroke_width", 1)
                         )
-                        
+
                         txt = txt.set_position(text_overlay.get("position", "center"))
                         txt = txt.set_duration(scene["duration"])
-                        
+
                         if "fade" in text_overlay.get("animation", "").lower():
                             txt = txt.fadein(0.5).fadeout(0.5)
-                            
+
                         text_clips.append(txt)
-                
-                # If there are text clips, compose them with the image clip
-                if text_clips:
-                    scene_clip = CompositeVideoClip([img_clip] + text_clips)
-                    scene_clip = scene_clip.set_duration(img_clip.duration)
-                else:
-                    scene_clip = img_clip
-                
-                video_clips.append(scene_clip)
-            
-            # Concatenate all clips
-            final_clip = concatenate_videoclips(video_clips, method="compose")
-            
-            # Add audio if available
-            if audio_path:
-                audio = AudioFileClip(audio_path)
-                final_clip = final_clip.set_audio(audio)
-            
-            # Write the final video
-            final_clip.write_videofile(
-                output_path,
-                fps=24,
-                codec="libx264",
-                audio_codec="aac",
-                preset="ultrafast"
-            )
-            
+
+                    # If there are text clips, compose them with the image clip
+                    if text_clips:
+                        scene_clip = CompositeVideoClip([img_clip] + text_clips)
+                        scene_clip = scene_clip.set_duration(img_clip.duration)
+                    else:
+                        scene_clip = img_clip
+
+                    video_clips.append(scene_clip)
+
+                # Concatenate all clips
+                final_clip = concatenate_videoclips(video_clips, method="compose")
+
+                # Add audio if available
+                if audio_path:
+                    audio = AudioFileClip(audio_path)
+                    final_clip = final_clip.set_audio(audio)
+
+                # Write the final video with the hardware encoder when available
+                write_kwargs = hw_codec_write_kwargs()
+                if HW_VIDEO_CODEC == 'libx264':
+                    write_kwargs["preset"] = "ultrafast"
+                final_clip.write_videofile(
+                    output_path,
+                    fps=24,
+                    codec=HW_VIDEO_CODEC,
+                    audio_codec="aac",
+                    ffmpeg_params=hw_codec_ffmpeg_params(),
+                    **write_kwargs
+                )
+
             # Update job status to completed
             job_status[job_id].status = "completed"
             job_status[job_id].progress = 100
@@ -2214,12 +4386,29 @@ Make it high quality, professional, and NOT AI-generated looking. Create a clean
         job_status[job_id].status = "failed"
         job_status[job_id].error = f"Error in ad generation: {str(e)}"
 
+if celery is not None:
+    @celery.task(bind=True, name='videogen.process_ad_generation')
+    def process_ad_generation_task(self, prompt, brand_name, tagline, target_audience,
+                                   duration, style, template, color_scheme, animation_style, voice_file=None):
+        """Celery entry point for ad generation; the task ID doubles as the job ID"""
+        job_id = self.request.id
+        if job_id not in job_status:
+            job_status[job_id] = JobStatus(
+                status="processing",
+                progress=0,
+                estimated_time_remaining=calculate_estimated_time(duration, voice_file is not None),
+                started_at=time.time()
+            )
+        process_ad_generation(job_id, prompt, brand_name, tagline, target_audience,
+                              duration, style, template, color_scheme, animation_style, voice_file)
+        final_status = job_status.get(job_id)
+        return dict(final_status) if final_status else None
+
 def generate_testimonial_script(prompt, duration=45):
     """Generate a structured script for testimonial videos to improve lip sync"""
     try:
-        # Use OpenAI to create a testimonial script
-        from openai import OpenAI
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Use the shared OpenAI client to create a testimonial script
+        client = openai_client
         
         system_message = """
         You are an expert at creating natural-sounding testimonial scripts for business videos.
@@ -2292,8 +4481,9 @@ def generate_advanced_video():
             "error": None
         }
         
-        # Process the job in a background thread
-        Thread(target=process_advanced_video_job, args=(job_id, prompt, style, duration, video_source, add_voiceover, voice_id)).start()
+        # Queue the job on the bounded render pool - an unbounded Thread
+        # per request let N concurrent ffmpeg encodes thrash the CPU
+        VIDEO_POOL.submit(process_advanced_video_job, job_id, prompt, style, duration, video_source, add_voiceover, voice_id)
         
         return jsonify({
             "success": True,
@@ -2345,14 +4535,15 @@ def generate_eleven_labs_tts(text, voice_id, output_path):
         response = elevenlabs_requests.post(
             f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
             headers=headers,
-            json=data
+            json=data,
+            stream=True
         )
-        
+
         # Check if the request was successful
         if response.status_code == 200:
-            # Save the audio file
+            # Stream the MP3 to disk instead of buffering it whole
             with open(output_path, "wb") as f:
-                f.write(response.content)
+                shutil.copyfileobj(response.raw, f, length=1 << 16)
             return {"success": True, "audio_path": output_path}
         else:
             error_msg = f"Error from Eleven Labs API: {response.text}"
@@ -2584,13 +4775,15 @@ def process_advanced_video_job(job_id, prompt, style, duration, video_source, ad
                     video_jobs[job_id]["progress"] = 90
                     video_jobs[job_id]["estimated_time_remaining"] = update_estimated_time(video_jobs[job_id], 90)
                     
-                    # Write the result to a file
+                    # Write the result with the hardware encoder when available
                     final_clip.write_videofile(
                         final_output_path,
-                        codec='libx264',
+                        codec=HW_VIDEO_CODEC,
                         audio_codec='aac',
                         temp_audiofile=f"{output_dir}/temp_audio.m4a",
-                        remove_temp=True
+                        remove_temp=True,
+                        ffmpeg_params=hw_codec_ffmpeg_params(),
+                        **hw_codec_write_kwargs()
                     )
                     
                     # Update job status with the new file
@@ -2646,7 +4839,7 @@ def generate_and_save_image(prompt, size="1024x1024"):
         os.makedirs('temp', exist_ok=True)
         
         # Generate image using OpenAI's DALL-E
-        response = openai.images.generate(
+        response = openai_client.images.generate(
             model="dall-e-3",
             prompt=prompt,
             size=size,
@@ -2656,15 +4849,14 @@ def generate_and_save_image(prompt, size="1024x1024"):
 
         # Get the generated image URL
         image_url = response.data[0].url
-        
-        # Download the image
-        image_data = requests.get(image_url).content
-        
-        # Save the image
+
+        # Stream the image to disk with 1 MiB reads instead of buffering
+        # the whole body as a Python bytes object
         output_path = os.path.join("temp", f"image_{int(time.time())}.png")
-        with open(output_path, 'wb') as f:
-            f.write(image_data)
-            
+        with DALLE_SESSION.get(image_url, stream=True) as image_response:
+            with open(output_path, 'wb') as f:
+                shutil.copyfileobj(image_response.raw, f, length=1 << 20)
+
         return output_path
     except Exception as e:
         print(f"Error generating image: {str(e)}")
@@ -10,6 +10,13 @@ from moviepy.editor import (
 from moviepy.video.fx import all as vfx
 from moviepy.video.VideoClip import VideoClip
 
+# Performance note: the hot paths in this app are OpenAI/HTTP/ffmpeg, which
+# JIT compilation cannot speed up - do not reach for Numba there. If a
+# per-frame Python loop is ever added here (zoompan curves, waveform-to-
+# caption alignment, motion analysis), write it against numpy arrays and
+# decorate it @numba.njit(parallel=True, cache=True) from the start, with a
+# small dummy-shape call at import time to absorb the compile cost.
+
 # Register custom effects at module import time
 def slide_in(clip, duration=1.0, side="left"):
     """